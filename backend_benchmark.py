@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Benchmark Regression Suite for FlowSpace Core API Endpoints
+Times the backend_test.py scenarios against a seeded board at several sizes,
+stores the results as a JSON baseline and fails when a tracked endpoint errors
+or its percentile regresses. Timings go straight to Node unless --base-url says otherwise.
+
+  python backend_benchmark.py --update-baseline     # record a new baseline
+  python backend_benchmark.py                       # compare against it
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import argparse
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from backend_test import Colors, FlowSpaceInviteTester, LatencyRecorder, LoadScenarios, invite_document
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+# Node worker 0 directly: through the proxy (:8001) GET timings would mix
+# response-cache hits with real handler time
+DEFAULT_BENCHMARK_URL = os.environ.get('BENCHMARK_URL', 'http://localhost:8002')
+
+# Endpoints compared against the baseline
+TRACKED_ENDPOINTS = [
+    'GET /api/boards',
+    'GET /api/boards/:id',
+    'GET /api/cards/:boardId/cards',
+    'POST /api/cards/:boardId/cards',
+    'PUT /api/cards/:id',
+    'DELETE /api/cards/:id',
+    'GET /api/activity',
+    'POST /api/invite/:token/accept',
+]
+
+class BenchmarkScenarios(LoadScenarios):
+    """LoadScenarios plus the read/delete calls the load mix doesn't need"""
+
+    async def list_boards(self, state: Dict):
+        await self.call('GET /api/boards', 'GET', '/api/boards', self.tester.owner_token, 200)
+
+    async def get_board(self, state: Dict):
+        await self.call('GET /api/boards/:id', 'GET', f"/api/boards/{self.tester.board_id}",
+                        self.tester.owner_token, 200)
+
+    async def delete_card(self, state: Dict):
+        # Create outside the recorder so only the delete is timed
+        recorder, self.recorder = self.recorder, LatencyRecorder()
+        try:
+            await self.create_card(state)
+        finally:
+            self.recorder = recorder
+        if state.get('cards'):
+            card_id = state['cards'].pop()
+            await self.call('DELETE /api/cards/:id', 'DELETE', f"/api/cards/{card_id}",
+                            self.tester.owner_token, 200)
+
+BENCHMARK_FLOWS = [
+    'list_boards', 'get_board', 'list_cards', 'create_card',
+    'update_card', 'delete_card', 'activity_feed', 'accept_invite',
+]
+
+def seed_board(tester: FlowSpaceInviteTester, size: int) -> List[str]:
+    """Replace the test board's cards and activities with `size` of each"""
+    from pymongo import MongoClient
+    from bson import ObjectId
+    db = MongoClient('mongodb://localhost:27017/flowspace')['flowspace']
+    board_id = ObjectId(tester.board_id)
+    owner_id = ObjectId(tester.owner_id)
+    db.cards.delete_many({'boardId': board_id})
+    db.activities.delete_many({'boardId': board_id})
+    db.invites.delete_many({'boardId': board_id})
+
+    board = db.boards.find_one({'_id': board_id}, {'columns': 1})
+    column_ids = [column['_id'] for column in board['columns']]
+    now = datetime.utcnow()
+    cards = []
+    activities = []
+    for i in range(size):
+        when = now - timedelta(minutes=size - i)
+        card_id = ObjectId()
+        cards.append({
+            '_id': card_id,
+            'boardId': board_id,
+            'columnId': column_ids[i % len(column_ids)],
+            'title': f'Benchmark Card {i}',
+            'description': 'Seeded for benchmarking',
+            'createdBy': owner_id,
+            'updatedBy': owner_id,
+            'tags': ['benchmark'],
+            'order': i,
+            'history': [
+                {'_id': ObjectId(), 'by': owner_id, 'action': 'edited', 'when': when, 'data': {'field': 'title'}}
+                for _ in range(3)
+            ],
+            'createdAt': when,
+            'updatedAt': when,
+        })
+        activities.append({
+            'userId': owner_id,
+            'userName': 'Board Owner',
+            'boardId': board_id,
+            'action': 'created',
+            'entityType': 'card',
+            'entityId': str(card_id),
+            'entityTitle': f'Benchmark Card {i}',
+            'description': f'Board Owner created card "Benchmark Card {i}"',
+            'timestamp': when,
+            'createdAt': when,
+            'updatedAt': when,
+        })
+    for i in range(0, size, 1000):
+        db.cards.insert_many(cards[i:i + 1000], ordered=False)
+        db.activities.insert_many(activities[i:i + 1000], ordered=False)
+    return [str(card['_id']) for card in cards]
+
+def seed_invites(tester: FlowSpaceInviteTester, count: int) -> List[str]:
+    """Insert `count` pending invites up front and return their tokens"""
+    # POST /api/invite would mail each one over SMTP and put that latency
+    # between the timed calls; with seeded tokens only the accept is timed
+    from pymongo import MongoClient
+    db = MongoClient('mongodb://localhost:27017/flowspace')['flowspace']
+    invites = [invite_document(tester) for _ in range(count)]
+    if invites:
+        db.invites.insert_many(invites, ordered=False)
+    return [invite['token'] for invite in invites]
+
+async def run_size(tester: FlowSpaceInviteTester, size: int, iterations: int, warmup: int) -> Dict[str, Dict]:
+    import httpx
+    card_ids = seed_board(tester, size)
+    recorder = LatencyRecorder()
+    async with httpx.AsyncClient(base_url=tester.base_url, timeout=60.0) as client:
+        scenarios = BenchmarkScenarios(tester, client, LatencyRecorder())
+        state = {'cards': list(card_ids), 'invites': seed_invites(tester, warmup + iterations)}
+        for _ in range(warmup):
+            for flow in BENCHMARK_FLOWS:
+                await getattr(scenarios, flow)(state)
+        scenarios.recorder = recorder
+        started = time.monotonic()
+        for _ in range(iterations):
+            # Shuffle so no endpoint always runs right after a write
+            for flow in random.sample(BENCHMARK_FLOWS, len(BENCHMARK_FLOWS)):
+                await getattr(scenarios, flow)(state)
+        return recorder.summary(time.monotonic() - started)
+
+def compare(results: Dict, baseline: Dict, percentile: str, tolerance: float, slack_ms: float) -> List[str]:
+    """Describe every tracked endpoint slower than baseline * (1 + tolerance) + slack"""
+    regressions = []
+    for size, endpoints in results.items():
+        for endpoint in TRACKED_ENDPOINTS:
+            current = endpoints.get(endpoint, {}).get(percentile)
+            previous = baseline.get(size, {}).get(endpoint, {}).get(percentile)
+            if current is None or previous is None:
+                continue
+            limit = previous * (1 + tolerance) + slack_ms
+            if current > limit:
+                regressions.append(
+                    f"size={size} {endpoint}: {percentile} {current:.1f}ms > {limit:.1f}ms (baseline {previous:.1f}ms)"
+                )
+    return regressions
+
+def failures(results: Dict, max_error_rate: float) -> List[str]:
+    """Describe every tracked endpoint that errored or never completed a request"""
+    problems = []
+    for size, endpoints in results.items():
+        for endpoint in TRACKED_ENDPOINTS:
+            row = endpoints.get(endpoint)
+            if not row:
+                problems.append(f"size={size} {endpoint}: no samples recorded")
+            elif row['error_rate'] > max_error_rate:
+                problems.append(f"size={size} {endpoint}: error rate {row['error_rate']:.2%}")
+    return problems
+
+def print_results(size: str, summary: Dict[str, Dict], baseline: Dict, percentile: str):
+    print(f"\n{Colors.BOLD}Dataset size {size}{Colors.RESET}")
+    print(f"{'Endpoint':<36}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'baseline':>12}{'Err%':>8}")
+    for endpoint in TRACKED_ENDPOINTS:
+        row = summary.get(endpoint)
+        if not row:
+            continue
+        previous = baseline.get(size, {}).get(endpoint, {}).get(percentile)
+        previous_text = f"{previous:.1f}" if previous is not None else '-'
+        print(f"{endpoint:<36}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}"
+              f"{previous_text:>12}{row['error_rate'] * 100:>8.2f}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='FlowSpace API benchmark regression suite')
+    parser.add_argument('--base-url', default=DEFAULT_BENCHMARK_URL,
+                        help='server to time (default: Node directly, bypassing the caching proxy)')
+    parser.add_argument('--max-error-rate', type=float, default=0.0,
+                        help='fail when a tracked endpoint errors more often than this')
+    parser.add_argument('--sizes', default='100,1000,5000', help='comma-separated card counts to seed')
+    parser.add_argument('--iterations', type=int, default=30, help='timed rounds per size')
+    parser.add_argument('--warmup', type=int, default=3, help='untimed rounds per size')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline JSON file')
+    parser.add_argument('--percentile', choices=['p50_ms', 'p95_ms', 'p99_ms'], default='p95_ms',
+                        help='percentile compared against the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.20, help='allowed relative regression')
+    parser.add_argument('--slack-ms', type=float, default=2.0, help='absolute slack so tiny timings do not flap')
+    parser.add_argument('--update-baseline', action='store_true', help='write results as the new baseline')
+    parser.add_argument('--output', help='also write this run\'s results to a JSON file')
+    return parser.parse_args()
+
+def main() -> bool:
+    args = parse_args()
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline_document = json.load(f)
+        baseline = baseline_document.get('results', {})
+        baseline_url = baseline_document.get('baseUrl')
+        if baseline_url and baseline_url != args.base_url.rstrip('/'):
+            print(f"{Colors.YELLOW}Warning: baseline was recorded against {baseline_url}, "
+                  f"this run targets {args.base_url}{Colors.RESET}")
+
+    tester = FlowSpaceInviteTester()
+    tester.base_url = args.base_url.rstrip('/')
+    if not tester.setup_test_data():
+        print(f"\n{Colors.RED}Failed to setup test data. Exiting.{Colors.RESET}")
+        return False
+
+    results: Dict[str, Dict] = {}
+    try:
+        for size in sizes:
+            summary = asyncio.run(run_size(tester, size, args.iterations, args.warmup))
+            results[str(size)] = summary
+            print_results(str(size), summary, baseline, args.percentile)
+    finally:
+        tester.cleanup_test_data()
+
+    document = {
+        'recordedAt': datetime.utcnow().isoformat() + 'Z',
+        'iterations': args.iterations,
+        'baseUrl': tester.base_url,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(document, f, indent=2)
+
+    # Fast failures would otherwise pass, or even beat the baseline
+    problems = failures(results, args.max_error_rate)
+    if problems:
+        print(f"\n{Colors.RED}{len(problems)} endpoint(s) failed:{Colors.RESET}")
+        for line in problems:
+            print(f"  ✗ {line}")
+        return False
+
+    if args.update_baseline or not baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(document, f, indent=2)
+        print(f"\n{Colors.GREEN}Baseline written to {args.baseline}{Colors.RESET}")
+        return True
+
+    regressions = compare(results, baseline, args.percentile, args.tolerance, args.slack_ms)
+    if regressions:
+        print(f"\n{Colors.RED}{len(regressions)} regression(s) beyond {args.tolerance:.0%} tolerance:{Colors.RESET}")
+        for line in regressions:
+            print(f"  ✗ {line}")
+        return False
+    print(f"\n{Colors.GREEN}No regressions beyond {args.tolerance:.0%} tolerance{Colors.RESET}")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data Generator for FlowSpace Scale Testing
+Bulk-loads users, boards, cards, notes and activities in the production shape
+(thousands of boards, 100k+ cards, millions of activities) and tears them down again.
+
+  python backend_datagen.py generate --users 2000 --boards 5000 --cards-per-board 40
+  python backend_datagen.py teardown
+"""
+
+import os
+import re
+import time
+import random
+import argparse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017/flowspace')
+
+# Every generated user lives under this domain; teardown starts from it
+SYNTHETIC_DOMAIN = 'synthetic.flowspace.test'
+
+COLUMN_TITLES = ['To Do', 'In Progress', 'Review', 'Done']
+TAGS = ['bug', 'feature', 'design', 'backend', 'frontend', 'urgent', 'research', 'ops']
+WORDS = ['sync', 'board', 'api', 'login', 'export', 'avatar', 'invite', 'notes',
+         'socket', 'cache', 'deploy', 'search', 'layout', 'billing', 'metrics', 'docs']
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    RESET = '\033[0m'
+    BOLD = '\033[1m'
+
+def get_db():
+    from pymongo import MongoClient
+    client = MongoClient(MONGO_URL)
+    return client.get_default_database('flowspace')
+
+class SyntheticDataGenerator:
+    def __init__(self, users: int, boards: int, cards_per_board: int, members_per_board: int,
+                 history_length: int, distribution: str, batch_size: int, workers: int, seed: int):
+        self.users = users
+        self.boards = boards
+        self.cards_per_board = cards_per_board
+        self.members_per_board = members_per_board
+        self.history_length = history_length
+        self.distribution = distribution
+        self.batch_size = batch_size
+        self.workers = workers
+        self.random = random.Random(seed)
+        self.db = get_db()
+        self.counts: Dict[str, int] = {}
+        self.pending = set()
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+
+    def insert(self, collection: str, docs: List[Dict]):
+        """Queue an unordered insert_many; keeps at most 2x workers batches in memory"""
+        if not docs:
+            return
+        while len(self.pending) >= self.workers * 2:
+            done, self.pending = wait(self.pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                future.result()
+        self.pending.add(self.executor.submit(
+            self.db[collection].insert_many, docs, ordered=False
+        ))
+        self.counts[collection] = self.counts.get(collection, 0) + len(docs)
+
+    def flush(self):
+        for future in wait(self.pending).done:
+            future.result()
+        self.pending = set()
+
+    def card_count(self) -> int:
+        """Cards for one board; 'skewed' gives a long tail of very large boards"""
+        if self.distribution == 'uniform':
+            return self.cards_per_board
+        # Pareto with alpha 1.5 has mean 3x its scale
+        count = int(self.random.paretovariate(1.5) * self.cards_per_board / 3)
+        return min(count, self.cards_per_board * 50)
+
+    def phrase(self, words: int) -> str:
+        return ' '.join(self.random.choice(WORDS) for _ in range(words)).capitalize()
+
+    def make_users(self, now: datetime) -> List[Dict]:
+        from bson import ObjectId
+        users = []
+        for i in range(self.users):
+            users.append({
+                '_id': ObjectId(),
+                'name': f'Synthetic User {i}',
+                'email': f'user{i}@{SYNTHETIC_DOMAIN}',
+                'password': 'synthetic123',
+                'avatarUrl': f'https://api.dicebear.com/7.x/avataaars/svg?seed=synthetic{i}',
+                'createdAt': now,
+                'updatedAt': now,
+            })
+        return users
+
+    def make_history(self, user_ids, created_at: datetime) -> List[Dict]:
+        from bson import ObjectId
+        history = []
+        when = created_at
+        for _ in range(self.random.randint(0, self.history_length)):
+            when += timedelta(minutes=self.random.randint(1, 600))
+            history.append({
+                '_id': ObjectId(),
+                'by': self.random.choice(user_ids),
+                'action': self.random.choice(['moved', 'edited', 'tagged', 'assigned']),
+                'when': when,
+                'data': {'field': self.random.choice(['columnId', 'title', 'tags', 'order'])},
+            })
+        return history
+
+    def generate_board(self, users: List[Dict], by_id: Dict, now: datetime, buffers: Dict[str, List[Dict]]):
+        from bson import ObjectId
+        owner = self.random.choice(users)
+        others = self.random.sample(users, min(self.members_per_board, len(users)))
+        members = [{'_id': ObjectId(), 'userId': owner['_id'], 'role': 'owner'}]
+        members += [
+            {'_id': ObjectId(), 'userId': user['_id'], 'role': self.random.choice(['editor', 'viewer'])}
+            for user in others if user['_id'] != owner['_id']
+        ]
+        columns = [{'_id': ObjectId(), 'title': title, 'order': i} for i, title in enumerate(COLUMN_TITLES)]
+        board_created = now - timedelta(days=self.random.randint(1, 365))
+        board = {
+            '_id': ObjectId(),
+            'title': f'{self.phrase(2)} Board',
+            'description': self.phrase(6),
+            'ownerId': owner['_id'],
+            'members': members,
+            'columns': columns,
+            'createdAt': board_created,
+            'updatedAt': board_created,
+        }
+        buffers['boards'].append(board)
+        buffers['notes'].append({
+            '_id': ObjectId(),
+            'boardId': board['_id'],
+            'content': f'# {board["title"]}\n\n{self.phrase(20)}',
+            'updatedBy': owner['_id'],
+            'createdAt': board_created,
+            'updatedAt': board_created,
+        })
+
+        member_ids = [member['userId'] for member in members]
+        for order in range(self.card_count()):
+            created_by = self.random.choice(member_ids)
+            created_at = board_created + timedelta(minutes=self.random.randint(0, 60 * 24 * 180))
+            history = self.make_history(member_ids, created_at)
+            updated_by = history[-1]['by'] if history else created_by
+            updated_at = history[-1]['when'] if history else created_at
+            card = {
+                '_id': ObjectId(),
+                'boardId': board['_id'],
+                'columnId': self.random.choice(columns)['_id'],
+                'title': self.phrase(4),
+                'description': self.phrase(15),
+                'createdBy': created_by,
+                'updatedBy': updated_by,
+                'tags': self.random.sample(TAGS, self.random.randint(0, 3)),
+                'order': order,
+                'history': history,
+                'createdAt': created_at,
+                'updatedAt': updated_at,
+            }
+            buffers['cards'].append(card)
+
+            # One activity for the create plus one per history entry
+            events = [(created_by, 'created', created_at)] + [(h['by'], 'updated', h['when']) for h in history]
+            for user_id, action, when in events:
+                user = by_id[user_id]
+                buffers['activities'].append({
+                    'userId': user_id,
+                    'userName': user['name'],
+                    'userAvatar': user['avatarUrl'],
+                    'boardId': board['_id'],
+                    'action': action,
+                    'entityType': 'card',
+                    'entityId': str(card['_id']),
+                    'entityTitle': card['title'],
+                    'description': f'{user["name"]} {action} card "{card["title"]}"',
+                    'timestamp': when,
+                    'createdAt': when,
+                    'updatedAt': when,
+                })
+
+        for collection, docs in buffers.items():
+            if len(docs) >= self.batch_size:
+                self.insert(collection, docs)
+                buffers[collection] = []
+
+    def run(self) -> bool:
+        print(f"\n{Colors.BOLD}Generating synthetic data...{Colors.RESET}")
+        started = time.time()
+        now = datetime.utcnow()
+        try:
+            users = self.make_users(now)
+            for i in range(0, len(users), self.batch_size):
+                self.insert('users', users[i:i + self.batch_size])
+
+            by_id = {user['_id']: user for user in users}
+            buffers: Dict[str, List[Dict]] = {'boards': [], 'notes': [], 'cards': [], 'activities': []}
+            for i in range(self.boards):
+                self.generate_board(users, by_id, now, buffers)
+                if (i + 1) % 500 == 0:
+                    print(f"  {i + 1}/{self.boards} boards, {self.counts.get('cards', 0)} cards queued")
+            for collection, docs in buffers.items():
+                self.insert(collection, docs)
+            self.flush()
+        except Exception as e:
+            print(f"{Colors.RED}Generation failed: {str(e)}{Colors.RESET}")
+            import traceback
+            traceback.print_exc()
+            return False
+        finally:
+            self.executor.shutdown(wait=True)
+
+        elapsed = time.time() - started
+        total = sum(self.counts.values())
+        for collection, count in self.counts.items():
+            print(f"  Inserted {count} {collection}")
+        print(f"{Colors.GREEN}Inserted {total} documents in {elapsed:.1f}s ({total / elapsed:.0f} docs/s){Colors.RESET}")
+        return True
+
+def chunks(items: List, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def teardown(batch_size: int, workers: int) -> bool:
+    """Delete everything owned by synthetic users, in parallel per chunk of boards"""
+    print(f"\n{Colors.BOLD}Tearing down synthetic data...{Colors.RESET}")
+    started = time.time()
+    try:
+        db = get_db()
+        pattern = re.escape(f'@{SYNTHETIC_DOMAIN}') + '$'
+        user_ids = [u['_id'] for u in db.users.find({'email': {'$regex': pattern}}, {'_id': 1})]
+        board_ids = [b['_id'] for b in db.boards.find({'ownerId': {'$in': user_ids}}, {'_id': 1})]
+
+        jobs = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for ids in chunks(board_ids, batch_size):
+                for collection in ('cards', 'activities', 'notes', 'invites'):
+                    jobs.append((collection, executor.submit(db[collection].delete_many, {'boardId': {'$in': ids}})))
+            for ids in chunks(user_ids, batch_size):
+                # Board-less activities (teams, joins) are keyed by user only
+                jobs.append(('activities', executor.submit(db.activities.delete_many, {'userId': {'$in': ids}})))
+            deleted: Dict[str, int] = {}
+            for collection, future in jobs:
+                deleted[collection] = deleted.get(collection, 0) + future.result().deleted_count
+
+        deleted['boards'] = db.boards.delete_many({'_id': {'$in': board_ids}}).deleted_count
+        deleted['users'] = db.users.delete_many({'_id': {'$in': user_ids}}).deleted_count
+        for collection, count in deleted.items():
+            print(f"  Deleted {count} {collection}")
+        print(f"{Colors.GREEN}Teardown finished in {time.time() - started:.1f}s{Colors.RESET}")
+        return True
+    except Exception as e:
+        print(f"{Colors.RED}Teardown failed: {str(e)}{Colors.RESET}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='FlowSpace synthetic data generator')
+    parser.add_argument('command', choices=['generate', 'teardown'])
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--boards', type=int, default=2000)
+    parser.add_argument('--cards-per-board', type=int, default=50, help='mean cards per board')
+    parser.add_argument('--members-per-board', type=int, default=5)
+    parser.add_argument('--history-length', type=int, default=8, help='max history entries per card')
+    parser.add_argument('--distribution', choices=['skewed', 'uniform'], default='skewed',
+                        help='cards-per-board distribution')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=8, help='parallel insert/delete batches')
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args()
+
+def main() -> bool:
+    args = parse_args()
+    if args.command == 'teardown':
+        return teardown(args.batch_size, args.workers)
+    generator = SyntheticDataGenerator(
+        users=args.users,
+        boards=args.boards,
+        cards_per_board=args.cards_per_board,
+        members_per_board=args.members_per_board,
+        history_length=args.history_length,
+        distribution=args.distribution,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        seed=args.seed,
+    )
+    return generator.run()
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
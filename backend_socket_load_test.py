@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Socket.io Fan-out Load Test for FlowSpace Real-time Broadcasts
+Opens many concurrent Socket.io clients, joins them to board rooms via `joinBoard`,
+creates cards over HTTP and measures how long each `card:create` takes to reach
+every client in the room.
+
+Requires: pip install "python-socketio[asyncio_client]" httpx pymongo pyjwt
+
+  python backend_socket_load_test.py --clients 2000 --boards 20 --mutations 10
+"""
+
+import time
+import asyncio
+import argparse
+from datetime import datetime
+from typing import Dict, List
+
+from backend_test import Colors, FlowSpaceInviteTester, percentile
+
+class BroadcastStats:
+    """Receipt times of every card:create, keyed by card id"""
+    def __init__(self):
+        self.receipts: Dict[str, List[float]] = {}
+        # card id -> (board id, request sent, HTTP response received)
+        self.mutations: Dict[str, tuple] = {}
+        self.misrouted = 0
+        self.connected = 0
+        self.connect_failures = 0
+
+    def received(self, card: Dict, board_id: str, at: float):
+        card_id = card.get('_id')
+        if not card_id:
+            return
+        self.receipts.setdefault(card_id, []).append(at)
+        if str(card.get('boardId')) != board_id:
+            # Delivered to a socket that never joined this card's board
+            self.misrouted += 1
+
+class FlowSpaceSocketLoadTester:
+    def __init__(self, tester: FlowSpaceInviteTester, clients: int, boards: int, mutations: int,
+                 rate: float, connect_concurrency: int, settle: float):
+        self.tester = tester
+        self.clients = clients
+        self.boards = boards
+        self.mutations = mutations
+        self.rate = rate
+        self.connect_concurrency = connect_concurrency
+        self.settle = settle
+        self.board_ids: List[str] = []
+        self.column_ids: Dict[str, str] = {}
+        self.stats = BroadcastStats()
+        self.sockets = []
+        self.room_sizes: Dict[str, int] = {}
+
+    def create_boards(self):
+        """Extra rooms beyond the tester's board, inserted the same way setup_test_data does"""
+        from pymongo import MongoClient
+        from bson import ObjectId
+        db = MongoClient('mongodb://localhost:27017/flowspace')['flowspace']
+        self.board_ids = [self.tester.board_id]
+        self.column_ids[self.tester.board_id] = self.tester.column_id
+        owner_id = ObjectId(self.tester.owner_id)
+        for i in range(self.boards - 1):
+            column_id = ObjectId()
+            result = db.boards.insert_one({
+                'title': f'Socket Load Board {i}',
+                'ownerId': owner_id,
+                'members': [{'userId': owner_id, 'role': 'owner'}],
+                'columns': [{'_id': column_id, 'title': 'To Do', 'order': 0}],
+                'createdAt': datetime.utcnow(),
+                'updatedAt': datetime.utcnow(),
+            })
+            self.board_ids.append(str(result.inserted_id))
+            self.column_ids[str(result.inserted_id)] = str(column_id)
+
+    def delete_boards(self):
+        from pymongo import MongoClient
+        from bson import ObjectId
+        db = MongoClient('mongodb://localhost:27017/flowspace')['flowspace']
+        extra = [ObjectId(board_id) for board_id in self.board_ids if board_id != self.tester.board_id]
+        db.cards.delete_many({'boardId': {'$in': extra}})
+        db.activities.delete_many({'boardId': {'$in': extra + [ObjectId(self.tester.board_id)]}})
+        db.boards.delete_many({'_id': {'$in': extra}})
+
+    async def open_client(self, board_id: str, gate: asyncio.Semaphore):
+        import socketio
+        sio = socketio.AsyncClient(reconnection=False)
+
+        @sio.on('card:create')
+        async def on_card_create(card):
+            self.stats.received(card, board_id, time.perf_counter())
+
+        async with gate:
+            try:
+                # boardId on the handshake lets a multi-worker proxy pin the room
+                await sio.connect(f"{self.tester.base_url}?boardId={board_id}",
+                                  transports=['websocket'], wait_timeout=30)
+                await sio.emit('joinBoard', board_id)
+                self.stats.connected += 1
+                self.room_sizes[board_id] = self.room_sizes.get(board_id, 0) + 1
+                self.sockets.append(sio)
+            except Exception:
+                self.stats.connect_failures += 1
+
+    async def drive_mutations(self, client):
+        interval = 1.0 / self.rate if self.rate else 0
+        for i in range(self.mutations):
+            for board_id in self.board_ids:
+                sent = time.perf_counter()
+                try:
+                    response = await client.post(
+                        f"/api/cards/{board_id}/cards",
+                        json={'columnId': self.column_ids[board_id], 'title': f'Fan-out {i}'},
+                        headers={
+                            'Authorization': f'Bearer {self.tester.owner_token}',
+                            'X-Board-Id': board_id,
+                        },
+                    )
+                    answered = time.perf_counter()
+                    if response.status_code == 201:
+                        card_id = response.json()['card']['_id']
+                        self.stats.mutations[card_id] = (board_id, sent, answered)
+                except Exception as e:
+                    print(f"  {Colors.YELLOW}createCard failed: {str(e)}{Colors.RESET}")
+                if interval:
+                    await asyncio.sleep(interval)
+
+    async def run_async(self):
+        import httpx
+        gate = asyncio.Semaphore(self.connect_concurrency)
+        print(f"  Connecting {self.clients} clients across {len(self.board_ids)} boards...")
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            self.open_client(self.board_ids[i % len(self.board_ids)], gate) for i in range(self.clients)
+        ])
+        print(f"  Connected {self.stats.connected} clients in {time.perf_counter() - started:.1f}s "
+              f"({self.stats.connect_failures} failed)")
+        # joinBoard has no ack; give the server a moment to process the joins
+        await asyncio.sleep(1.0)
+
+        async with httpx.AsyncClient(base_url=self.tester.base_url, timeout=30.0) as client:
+            await self.drive_mutations(client)
+        await asyncio.sleep(self.settle)
+        await asyncio.gather(*[sio.disconnect() for sio in self.sockets], return_exceptions=True)
+
+    def report(self) -> bool:
+        from_response = []
+        from_request = []
+        expected_total = 0
+        delivered_total = 0
+        for card_id, (board_id, sent, answered) in self.stats.mutations.items():
+            receipts = self.stats.receipts.get(card_id, [])
+            expected_total += self.room_sizes.get(board_id, 0)
+            delivered_total += len(receipts)
+            from_response.extend(at - answered for at in receipts)
+            from_request.extend(at - sent for at in receipts)
+
+        print(f"\n{Colors.BOLD}{'='*60}{Colors.RESET}")
+        print(f"{Colors.BOLD}BROADCAST FAN-OUT SUMMARY{Colors.RESET}")
+        print(f"{Colors.BOLD}{'='*60}{Colors.RESET}")
+        print(f"Clients connected:   {self.stats.connected} ({self.stats.connect_failures} failed)")
+        print(f"Cards created:       {len(self.stats.mutations)}")
+        print(f"Expected deliveries: {expected_total}")
+        print(f"Delivered:           {delivered_total}")
+        print(f"Misrouted:           {self.stats.misrouted} (received by sockets outside the card's board)")
+        for label, samples in (('from HTTP response', from_response), ('from HTTP request', from_request)):
+            if samples:
+                print(f"Latency {label:<19} p50 {percentile(samples, 50) * 1000:8.1f}ms  "
+                      f"p95 {percentile(samples, 95) * 1000:8.1f}ms  "
+                      f"p99 {percentile(samples, 99) * 1000:8.1f}ms  "
+                      f"max {max(samples) * 1000:8.1f}ms")
+        print(f"  (negative 'from HTTP response' values mean the broadcast beat the response)")
+        print(f"{Colors.BOLD}{'='*60}{Colors.RESET}\n")
+        in_room_delivered = delivered_total - self.stats.misrouted
+        return self.stats.connect_failures == 0 and in_room_delivered >= expected_total
+
+    def run(self) -> bool:
+        self.create_boards()
+        try:
+            asyncio.run(self.run_async())
+        finally:
+            self.delete_boards()
+        return self.report()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='FlowSpace Socket.io fan-out load test')
+    parser.add_argument('--clients', type=int, default=500, help='concurrent Socket.io clients')
+    parser.add_argument('--boards', type=int, default=10, help='board rooms to spread clients over')
+    parser.add_argument('--mutations', type=int, default=5, help='cards created per board')
+    parser.add_argument('--rate', type=float, default=20.0, help='createCard calls per second (0 = unthrottled)')
+    parser.add_argument('--connect-concurrency', type=int, default=100, help='simultaneous handshakes')
+    parser.add_argument('--settle', type=float, default=5.0, help='seconds to wait for late broadcasts')
+    return parser.parse_args()
+
+def main() -> bool:
+    args = parse_args()
+    print(f"{Colors.BOLD}{'='*60}{Colors.RESET}")
+    print(f"{Colors.BOLD}FlowSpace Socket.io Fan-out Load Test{Colors.RESET}")
+    print(f"{Colors.BOLD}{'='*60}{Colors.RESET}")
+
+    tester = FlowSpaceInviteTester()
+    if not tester.setup_test_data():
+        print(f"\n{Colors.RED}Failed to setup test data. Exiting.{Colors.RESET}")
+        return False
+    try:
+        load_tester = FlowSpaceSocketLoadTester(
+            tester, args.clients, max(args.boards, 1), args.mutations,
+            args.rate, args.connect_concurrency, args.settle,
+        )
+        return load_tester.run()
+    finally:
+        tester.cleanup_test_data()
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -9,8 +9,16 @@ import json
 import jwt
 import os
 import time
+import uuid
+import secrets
+import math
+import random
+import asyncio
+import argparse
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+from backend_datagen import SYNTHETIC_DOMAIN, get_db
 
 # Configuration
 BACKEND_URL = "http://localhost:8001"
@@ -220,6 +228,10 @@ class FlowSpaceInviteTester:
             if self.board_id:
                 db.cards.delete_many({'boardId': ObjectId(self.board_id)})
                 print(f"  Deleted test cards")
+
+                # Delete test activities (load mode leaves thousands behind)
+                db.activities.delete_many({'boardId': ObjectId(self.board_id)})
+                print(f"  Deleted test activities")
                 
                 # Delete test board
                 db.boards.delete_one({'_id': ObjectId(self.board_id)})
@@ -1266,6 +1278,228 @@ class FlowSpaceInviteTester:
         
         return passed == total
 
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100.0 * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+class LatencyRecorder:
+    """Collects per-endpoint latencies and errors for load and benchmark runs"""
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, endpoint: str, seconds: float, ok: bool):
+        self.samples.setdefault(endpoint, []).append(seconds)
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def summary(self, elapsed: float) -> Dict[str, Dict]:
+        """Throughput, error rate and p50/p95/p99 (ms) per endpoint"""
+        result = {}
+        for endpoint, samples in sorted(self.samples.items()):
+            errors = self.errors.get(endpoint, 0)
+            result[endpoint] = {
+                'requests': len(samples),
+                'errors': errors,
+                'error_rate': errors / len(samples),
+                'throughput': len(samples) / elapsed if elapsed else 0.0,
+                'p50_ms': percentile(samples, 50) * 1000,
+                'p95_ms': percentile(samples, 95) * 1000,
+                'p99_ms': percentile(samples, 99) * 1000,
+            }
+        return result
+
+def invite_document(tester: FlowSpaceInviteTester) -> Dict:
+    """A pending invite to the test board, as inviteController would store it"""
+    from bson import ObjectId
+    now = datetime.utcnow()
+    return {
+        'boardId': ObjectId(tester.board_id),
+        'invitedBy': ObjectId(tester.owner_id),
+        'email': f'load-{uuid.uuid4().hex[:12]}@{SYNTHETIC_DOMAIN}',
+        'token': secrets.token_hex(32),
+        'role': 'editor',
+        'status': 'pending',
+        'expiresAt': now + timedelta(days=7),
+        'createdAt': now,
+        'updatedAt': now,
+    }
+
+class LoadScenarios:
+    """The backend_test.py scenarios as async flows against one seeded board"""
+    def __init__(self, tester: FlowSpaceInviteTester, client, recorder: LatencyRecorder):
+        self.tester = tester
+        self.client = client
+        self.recorder = recorder
+        self.db = None
+
+    def headers(self, token: str) -> Dict[str, str]:
+        return {
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'application/json',
+            'X-Board-Id': self.tester.board_id,
+        }
+
+    async def call(self, endpoint: str, method: str, url: str, token: str, expected: int, body=None):
+        """Time one request; returns the parsed JSON body or None on failure"""
+        started = time.perf_counter()
+        ok = False
+        data = None
+        try:
+            response = await self.client.request(method, url, json=body, headers=self.headers(token))
+            ok = response.status_code == expected
+            if ok:
+                data = response.json()
+        except Exception:
+            ok = False
+        self.recorder.record(endpoint, time.perf_counter() - started, ok)
+        return data
+
+    async def create_card(self, state: Dict):
+        data = await self.call(
+            'POST /api/cards/:boardId/cards', 'POST',
+            f"/api/cards/{self.tester.board_id}/cards", self.tester.owner_token, 201,
+            {
+                'columnId': self.tester.column_id,
+                'title': f'Load Test Card {uuid.uuid4().hex[:8]}',
+                'description': 'Created by the load generator',
+                'tags': ['load'],
+            },
+        )
+        if data and 'card' in data:
+            state.setdefault('cards', []).append(data['card']['_id'])
+
+    async def update_card(self, state: Dict):
+        if not state.get('cards'):
+            await self.create_card(state)
+            if not state.get('cards'):
+                return
+        card_id = random.choice(state['cards'])
+        await self.call(
+            'PUT /api/cards/:id', 'PUT', f"/api/cards/{card_id}", self.tester.invitee_token, 200,
+            {'title': f'Updated {uuid.uuid4().hex[:8]}', 'order': time.time()},
+        )
+
+    async def list_cards(self, state: Dict):
+        await self.call(
+            'GET /api/cards/:boardId/cards', 'GET',
+            f"/api/cards/{self.tester.board_id}/cards", self.tester.owner_token, 200,
+        )
+
+    async def activity_feed(self, state: Dict):
+        await self.call('GET /api/activity', 'GET', '/api/activity?limit=50', self.tester.owner_token, 200)
+
+    def insert_invite(self) -> str:
+        """Write a pending invite for the test board straight to Mongo"""
+        if self.db is None:
+            self.db = get_db()
+        invite = invite_document(self.tester)
+        self.db.invites.insert_one(invite)
+        return invite['token']
+
+    async def accept_invite(self, state: Dict):
+        # POST /api/invite mails every invite through the real SMTP
+        # transport, so the invite is seeded and only the accept is timed.
+        # Callers may pre-seed tokens in state['invites'].
+        invites = state.get('invites')
+        token = invites.pop() if invites else await asyncio.to_thread(self.insert_invite)
+        await self.call(
+            'POST /api/invite/:token/accept', 'POST',
+            f"/api/invite/{token}/accept", self.tester.invitee_token, 200,
+        )
+
+# Relative weight of each flow in the virtual-user mix (reads dominate)
+LOAD_FLOWS = [
+    ('list_cards', 40),
+    ('activity_feed', 25),
+    ('create_card', 15),
+    ('update_card', 15),
+    ('accept_invite', 5),
+]
+
+class FlowSpaceLoadTester:
+    """Drives the test scenarios concurrently as weighted virtual-user flows"""
+    def __init__(self, tester: FlowSpaceInviteTester, users: int, ramp_up: float,
+                 duration: float, think_time: float):
+        self.tester = tester
+        self.users = users
+        self.ramp_up = ramp_up
+        self.duration = duration
+        self.think_time = think_time
+        self.recorder = LatencyRecorder()
+
+    async def virtual_user(self, scenarios: LoadScenarios, start_delay: float, deadline: float):
+        await asyncio.sleep(start_delay)
+        names = [name for name, _ in LOAD_FLOWS]
+        weights = [weight for _, weight in LOAD_FLOWS]
+        state: Dict = {}
+        while time.monotonic() < deadline:
+            flow = random.choices(names, weights=weights)[0]
+            await getattr(scenarios, flow)(state)
+            if self.think_time:
+                # Jittered think time so users don't move in lockstep
+                await asyncio.sleep(random.uniform(0, 2 * self.think_time))
+
+    async def run_async(self) -> float:
+        import httpx
+        limits = httpx.Limits(max_connections=self.users, max_keepalive_connections=self.users)
+        async with httpx.AsyncClient(base_url=self.tester.base_url, limits=limits, timeout=30.0) as client:
+            scenarios = LoadScenarios(self.tester, client, self.recorder)
+            started = time.monotonic()
+            deadline = started + self.ramp_up + self.duration
+            step = self.ramp_up / self.users if self.users else 0
+            await asyncio.gather(*[
+                self.virtual_user(scenarios, i * step, deadline) for i in range(self.users)
+            ])
+            return time.monotonic() - started
+
+    def run(self) -> bool:
+        print(f"\n{Colors.BOLD}Load test: {self.users} users, {self.ramp_up:.0f}s ramp-up, {self.duration:.0f}s steady{Colors.RESET}")
+        elapsed = asyncio.run(self.run_async())
+        return self.print_report(elapsed)
+
+    def print_report(self, elapsed: float) -> bool:
+        summary = self.recorder.summary(elapsed)
+        total = sum(row['requests'] for row in summary.values())
+        errors = sum(row['errors'] for row in summary.values())
+
+        print(f"\n{Colors.BOLD}{'='*96}{Colors.RESET}")
+        print(f"{Colors.BOLD}{'Endpoint':<36}{'Reqs':>8}{'Req/s':>9}{'Err%':>8}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}{Colors.RESET}")
+        for endpoint, row in summary.items():
+            color = Colors.RED if row['errors'] else Colors.GREEN
+            print(f"{endpoint:<36}{row['requests']:>8}{row['throughput']:>9.1f}"
+                  f"{color}{row['error_rate'] * 100:>8.2f}{Colors.RESET}"
+                  f"{row['p50_ms']:>11.1f}{row['p95_ms']:>11.1f}{row['p99_ms']:>11.1f}")
+        print(f"{Colors.BOLD}{'='*96}{Colors.RESET}")
+        print(f"Total: {total} requests in {elapsed:.1f}s "
+              f"({total / elapsed if elapsed else 0:.1f} req/s), {errors} errors "
+              f"({(errors / total * 100) if total else 0:.2f}%)\n")
+        return errors == 0
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='FlowSpace backend tests')
+    parser.add_argument('--load', action='store_true', help='run the scenarios concurrently as a load test')
+    parser.add_argument('--users', type=int, default=20, help='virtual users (load mode)')
+    parser.add_argument('--ramp-up', type=float, default=10.0, help='seconds to start all users (load mode)')
+    parser.add_argument('--duration', type=float, default=60.0, help='seconds at full load (load mode)')
+    parser.add_argument('--think-time', type=float, default=0.5, help='mean pause between flows per user (load mode)')
+    return parser.parse_args()
+
+def run_load_test(args) -> bool:
+    tester = FlowSpaceInviteTester()
+    if not tester.setup_test_data():
+        print(f"\n{Colors.RED}Failed to setup test data. Exiting.{Colors.RESET}")
+        return False
+    try:
+        load_tester = FlowSpaceLoadTester(tester, args.users, args.ramp_up, args.duration, args.think_time)
+        return load_tester.run()
+    finally:
+        tester.cleanup_test_data()
+
 def main():
     print(f"{Colors.BOLD}{'='*60}{Colors.RESET}")
     print(f"{Colors.BOLD}FlowSpace Backend Testing - Collaboration Features with Avatars{Colors.RESET}")
@@ -1304,5 +1538,6 @@ def main():
         tester.cleanup_test_data()
 
 if __name__ == "__main__":
-    success = main()
+    args = parse_args()
+    success = run_load_test(args) if args.load else main()
     exit(0 if success else 1)
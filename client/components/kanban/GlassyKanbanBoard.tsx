@@ -1,4 +1,4 @@
-import React, { useState, useMemo, useEffect } from 'react';
+import React, { useState, useMemo, useEffect, useRef } from 'react';
 import { DndContext, closestCenter, DragEndEvent, DragStartEvent } from '@dnd-kit/core';
 import { SortableContext, verticalListSortingStrategy, useSortable } from '@dnd-kit/sortable';
 import { CSS } from '@dnd-kit/utilities';
@@ -83,7 +83,7 @@ const getColumnConfig = (title: string) => {
 };
 
 export default function GlassyKanbanBoard() {
-  const { currentBoard, cards: boardCards, setCards } = useBoard();
+  const { currentBoard, cards: boardCards, setCards, columnPages, loadMoreCards } = useBoard();
   const { user } = useAuth();
   const [cards, setLocalCards] = useState<CardType[]>([]);
   const [activeCard, setActiveCard] = useState<CardType | null>(null);
@@ -98,11 +98,17 @@ export default function GlassyKanbanBoard() {
     }
   }, [boardCards]);
 
+  // A column with unloaded cards means the board is windowed; a full poll
+  // would pull every card back in, so only sockets keep it in sync then
+  const windowed = useRef(false);
+  windowed.current = Object.values(columnPages).some((page) => page.nextCursor);
+
   // Cross-environment sync: Poll for updates every 5 seconds
   useEffect(() => {
     if (!currentBoard?._id) return;
 
     const pollInterval = setInterval(async () => {
+      if (windowed.current) return;
       try {
         const { listCards } = await import('@/lib/api');
         const cardsData = await listCards(currentBoard._id);
@@ -275,6 +281,8 @@ export default function GlassyKanbanBoard() {
                       iconColor={config.iconColor}
                       badgeColor={config.badgeColor}
                       items={byColumn[col.id] || []}
+                      total={columnPages[col.id]?.nextCursor ? columnPages[col.id].count : undefined}
+                      onLoadMore={columnPages[col.id]?.nextCursor ? loadMoreCards : undefined}
                       onCreateCard={handleCreateCard}
                       onEditCard={handleEditCard}
                     />
@@ -308,6 +316,8 @@ function GlassColumn({
   iconColor,
   badgeColor,
   items,
+  total,
+  onLoadMore,
   onCreateCard,
   onEditCard,
 }: {
@@ -320,11 +330,20 @@ function GlassColumn({
   iconColor: string;
   badgeColor: string;
   items: CardType[];
+  // Server-side card count, set while part of the column is not loaded
+  total?: number;
+  onLoadMore?: (id: string) => void;
   onCreateCard: (id: string) => void;
   onEditCard: (card: CardType) => void;
 }) {
   const { setNodeRef } = useSortable({ id });
 
+  // Fetch the next window when scrolled close to the bottom
+  const handleScroll = (e: React.UIEvent<HTMLDivElement>) => {
+    const el = e.currentTarget;
+    if (onLoadMore && el.scrollHeight - el.scrollTop - el.clientHeight < 200) onLoadMore(id);
+  };
+
   return (
     <div
       ref={setNodeRef}
@@ -349,13 +368,13 @@ function GlassColumn({
           <h3 className="font-bold text-lg text-white">{title}</h3>
         </div>
         <Badge className={cn('px-2.5 py-1 border font-semibold text-sm', badgeColor)}>
-          {items.length}
+          {total ?? items.length}
         </Badge>
       </div>
 
       {/* Cards */}
       <SortableContext items={items.map((c) => c._id)} strategy={verticalListSortingStrategy}>
-        <div className="relative flex-1 overflow-y-auto space-y-3 pr-1 custom-scrollbar">
+        <div className="relative flex-1 overflow-y-auto space-y-3 pr-1 custom-scrollbar" onScroll={handleScroll}>
           {items.length === 0 ? (
             <motion.div
               initial={{ opacity: 0, y: 20 }}
@@ -11,7 +11,7 @@ import { useToast } from "@/hooks/use-toast";
 import RichTextEditor from "@/components/RichTextEditor";
 
 export function NotesPanel() {
-  const { currentBoard } = useBoard();
+  const { currentBoard, takeSnapshotNote } = useBoard();
   const navigate = useNavigate();
   const { toast } = useToast();
   const [value, setValue] = useState<string>("");
@@ -29,21 +29,23 @@ export function NotesPanel() {
     const socket = getSocket();
     socketRef.current = socket;
 
-    socket.on("note:update", (note: any) => {
+    const onNoteUpdate = (note: any) => {
       if (note.boardId === currentBoard._id) {
         setValue(note.content || "");
         setSyncing(false);
       }
-    });
-
-    socket.on("note:update:ok", () => {
+    };
+    const onNoteSaved = () => {
       setSyncing(false);
       setEditing(false);
-    });
+    };
+    socket.on("note:update", onNoteUpdate);
+    socket.on("note:update:ok", onNoteSaved);
 
+    // Remove only these handlers; BoardContext listens for note updates too
     return () => {
-      socket.off("note:update");
-      socket.off("note:update:ok");
+      socket.off("note:update", onNoteUpdate);
+      socket.off("note:update:ok", onNoteSaved);
     };
   }, [currentBoard]);
 
@@ -51,7 +53,8 @@ export function NotesPanel() {
     if (!currentBoard) return;
     try {
       setIsLoading(true);
-      const data = await getNote(currentBoard._id);
+      // The board snapshot already carried the note on first open
+      const data = takeSnapshotNote(currentBoard._id) || await getNote(currentBoard._id);
       setValue(data.note?.content || `# ${currentBoard.title} Notes\n\nStart writing your notes here...`);
     } catch (err) {
       console.error("Failed to load note:", err);
@@ -1,6 +1,6 @@
-import React, { createContext, useContext, useState, useEffect, ReactNode } from 'react';
-import { Board, listBoards, createBoard, getBoard } from '@/lib/api';
-import { getSocket } from '@/lib/socket';
+import React, { createContext, useContext, useState, useEffect, useRef, ReactNode } from 'react';
+import { Board, ColumnPage, listBoards, listCardWindows, listColumnCards, createBoard, getBoardSnapshot, setActiveBoard } from '@/lib/api';
+import { getSocket, pinSocketToBoard } from '@/lib/socket';
 import { useAuth } from './AuthContext';
 
 interface BoardContextType {
@@ -11,10 +11,32 @@ interface BoardContextType {
   error: string | null;
   setCurrentBoard: (board: Board | null) => void;
   setCards: (cards: any[] | ((prev: any[]) => any[])) => void;
+  // Total cards and next-page cursor per column; columns load CARD_WINDOW at a time
+  columnPages: Record<string, ColumnPage>;
+  loadMoreCards: (columnId: string) => Promise<void>;
+  // Note delivered with the board snapshot; handed out once and only while
+  // fresh, so a later or slower mount refetches instead of using stale content
+  takeSnapshotNote: (boardId: string) => { note: any } | null;
   refreshBoards: () => Promise<void>;
   createDemoBoard: () => Promise<void>;
 }
 
+// Field-level card change broadcast by the server; `changes` turns
+// `baseVersion` (or anything newer than it) into `version`.
+interface CardPatch {
+  _id: string;
+  boardId: string;
+  baseVersion: number;
+  version: number;
+  changes: Record<string, any>;
+}
+
+// Cards fetched per column on open and per "load more"; the rest stay on the server
+const CARD_WINDOW = 100;
+
+// How long the snapshot's note may stand in for a getNote request
+const SNAPSHOT_NOTE_MAX_AGE_MS = 5000;
+
 const BoardContext = createContext<BoardContextType | undefined>(undefined);
 
 export function BoardProvider({ children }: { children: ReactNode }) {
@@ -22,6 +44,14 @@ export function BoardProvider({ children }: { children: ReactNode }) {
   const [currentBoard, setCurrentBoard] = useState<Board | null>(null);
   const [boards, setBoards] = useState<Board[]>([]);
   const [cards, setCards] = useState<any[]>([]);
+  const [columnPages, setColumnPages] = useState<Record<string, ColumnPage>>({});
+  const loadingColumns = useRef(new Set<string>());
+  const snapshotNote = useRef<{ boardId: string; note: any; receivedAt: number } | null>(null);
+  // Read by the socket handlers, which are registered once
+  const cardsRef = useRef(cards);
+  cardsRef.current = cards;
+  const hasUnloaded = useRef(false);
+  hasUnloaded.current = Object.values(columnPages).some((page) => page.nextCursor);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
@@ -37,21 +67,16 @@ export function BoardProvider({ children }: { children: ReactNode }) {
       } else if (!currentBoard) {
         // Set the first board as current
         const firstBoard = data.boards[0];
-        const boardData = await getBoard(firstBoard._id);
-        setCurrentBoard(boardData.board);
-        
-        // Load cards for the board
-        try {
-          const { listCards } = await import('@/lib/api');
-          const cardsData = await listCards(firstBoard._id);
-          setCards(cardsData.cards || []);
-        } catch (cardsErr) {
-          console.error('Failed to load cards:', cardsErr);
-          setCards([]);
-        }
+        // Board and cards arrive together in one snapshot request
+        const snapshot = await getBoardSnapshot(firstBoard._id, { perColumn: CARD_WINDOW });
+        snapshotNote.current = { boardId: firstBoard._id, note: snapshot.note, receivedAt: Date.now() };
+        setCurrentBoard(snapshot.board);
+        setCards(snapshot.cards || []);
+        setColumnPages(snapshot.columns || {});
         
         // Join socket room for this board
-        const socket = getSocket();
+        setActiveBoard(firstBoard._id);
+        const socket = pinSocketToBoard(firstBoard._id);
         socket.emit('joinBoard', firstBoard._id);
       }
       setError(null);
@@ -72,17 +97,72 @@ export function BoardProvider({ children }: { children: ReactNode }) {
       setBoards([newBoard]);
       
       // Fetch full board details
-      const boardData = await getBoard(newBoard._id);
-      setCurrentBoard(boardData.board);
+      const snapshot = await getBoardSnapshot(newBoard._id, { perColumn: CARD_WINDOW });
+      snapshotNote.current = { boardId: newBoard._id, note: snapshot.note, receivedAt: Date.now() };
+      setCurrentBoard(snapshot.board);
+      setCards(snapshot.cards || []);
+      setColumnPages(snapshot.columns || {});
       
       // Join socket room
-      const socket = getSocket();
+      setActiveBoard(newBoard._id);
+      const socket = pinSocketToBoard(newBoard._id);
       socket.emit('joinBoard', newBoard._id);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to create demo board');
     }
   };
 
+  const takeSnapshotNote = (boardId: string) => {
+    const entry = snapshotNote.current;
+    snapshotNote.current = null;
+    if (!entry || entry.boardId !== boardId) return null;
+    if (Date.now() - entry.receivedAt > SNAPSHOT_NOTE_MAX_AGE_MS) return null;
+    return { note: entry.note };
+  };
+
+  // A note snapshotted for another board is never useful
+  useEffect(() => {
+    if (snapshotNote.current && snapshotNote.current.boardId !== currentBoard?._id) {
+      snapshotNote.current = null;
+    }
+  }, [currentBoard?._id]);
+
+  // Keeps windowed column totals in step with live creates, moves and deletes
+  const shiftColumnCounts = (deltas: Record<string, number>) => {
+    setColumnPages((prev) => {
+      let next = prev;
+      for (const [columnId, delta] of Object.entries(deltas)) {
+        const page = prev[columnId];
+        if (!page || !delta) continue;
+        if (next === prev) next = { ...prev };
+        next[columnId] = { ...page, count: Math.max(0, page.count + delta) };
+      }
+      return next;
+    });
+  };
+
+  // Appends the next window of one column; no-op while a page is in flight
+  const loadMoreCards = async (columnId: string) => {
+    const page = columnPages[columnId];
+    if (!currentBoard || !page?.nextCursor || loadingColumns.current.has(columnId)) return;
+    loadingColumns.current.add(columnId);
+    try {
+      const data = await listColumnCards(currentBoard._id, columnId, page.nextCursor, CARD_WINDOW);
+      setCards((prev) => {
+        const known = new Set(prev.map((c) => c._id));
+        return [...prev, ...(data.cards || []).filter((c: any) => !known.has(c._id))];
+      });
+      setColumnPages((prev) => ({
+        ...prev,
+        [columnId]: { ...prev[columnId], nextCursor: data.nextCursor },
+      }));
+    } catch (err) {
+      console.error('Failed to load more cards:', err);
+    } finally {
+      loadingColumns.current.delete(columnId);
+    }
+  };
+
   useEffect(() => {
     if (authLoading) return;
     refreshBoards();
@@ -92,17 +172,90 @@ export function BoardProvider({ children }: { children: ReactNode }) {
     
     socket.on('card:create', (newCard: any) => {
       setCards((prev) => [...prev, newCard]);
+      shiftColumnCounts({ [String(newCard.columnId)]: 1 });
     });
     
-    socket.on('card:update', (updatedCard: any) => {
-      setCards((prev) => prev.map(c => c._id === updatedCard._id ? updatedCard : c));
-    });
+    // A missed patch leaves a version gap; reload the first window of each column once
+    let resyncing = false;
+    const resync = async (boardId: string) => {
+      if (resyncing) return;
+      resyncing = true;
+      try {
+        const cardsData = await listCardWindows(boardId, CARD_WINDOW);
+        setCards(cardsData.cards || []);
+        setColumnPages(cardsData.columns || {});
+      } catch (err) {
+        console.error('Failed to resync cards:', err);
+      } finally {
+        resyncing = false;
+      }
+    };
+
+    const applyPatches = (patches: CardPatch[]) => {
+      if (!patches.length) return;
+      const byId = new Map(patches.map((patch) => [patch._id, patch]));
+      const boardId = patches[0].boardId;
+
+      // Gaps are detected against the last rendered cards so the updater
+      // below stays pure; a patch it skips for a gap is covered by the resync
+      let gap = false;
+      let seen = 0;
+      const moved: Record<string, number> = {};
+      for (const c of cardsRef.current) {
+        const patch = byId.get(c._id);
+        if (!patch) continue;
+        seen++;
+        const local = c.version ?? 0;
+        if (local < patch.version && local < patch.baseVersion) gap = true;
+        const columnId = patch.changes.columnId;
+        if (columnId && String(columnId) !== String(c.columnId) && local < patch.version && local >= patch.baseVersion) {
+          moved[String(c.columnId)] = (moved[String(c.columnId)] || 0) - 1;
+          moved[String(columnId)] = (moved[String(columnId)] || 0) + 1;
+        }
+      }
+
+      setCards((prev) =>
+        prev.map((c) => {
+          const patch = byId.get(c._id);
+          if (!patch) return c;
+          const local = c.version ?? 0;
+          if (local >= patch.version || local < patch.baseVersion) return c;
+          return { ...c, ...patch.changes, version: patch.version };
+        }),
+      );
+      shiftColumnCounts(moved);
+
+      // A card moved from beyond its column's loaded window has no known
+      // source column, so only a resync can correct both columns' totals
+      const local = new Set(cardsRef.current.map((c) => c._id));
+      const unknownMove = patches.some((patch) => patch.changes.columnId && !local.has(patch._id));
+
+      // Cards beyond a column's loaded window are not expected to be local
+      if (gap || unknownMove || (seen < byId.size && !hasUnloaded.current)) resync(boardId);
+    };
+
+    socket.on('card:patch', (patch: CardPatch) => applyPatches([patch]));
+
+    // Coalesced patches: one state change (and re-render) per batch
+    socket.on('cards:batch', ({ patches }: { patches: CardPatch[] }) => applyPatches(patches));
     
     socket.on('card:delete', (data: any) => {
       const cardId = data.id || data._id;
+      const columnId = data.columnId ?? cardsRef.current.find((c) => c._id === cardId)?.columnId;
       setCards((prev) => prev.filter(c => c._id !== cardId));
+      if (columnId) shiftColumnCounts({ [String(columnId)]: -1 });
     });
     
+    // Keep the snapshot note current until NotesPanel takes it
+    const onNoteUpdate = (note: any) => {
+      const entry = snapshotNote.current;
+      if (entry && note && String(note.boardId) === entry.boardId) {
+        snapshotNote.current = { ...entry, note };
+      }
+    };
+    socket.on('note:update', onNoteUpdate);
+    socket.on('note:update:ok', onNoteUpdate);
+
     socket.on('card:moved', ({ cardId, columnId }: { cardId: string; columnId: string }) => {
       setCards((prev) => prev.map(c => c._id === cardId ? { ...c, columnId } : c));
     });
@@ -110,9 +263,12 @@ export function BoardProvider({ children }: { children: ReactNode }) {
     return () => {
       // Clean up socket listeners
       socket.off('card:create');
-      socket.off('card:update');
+      socket.off('card:patch');
+      socket.off('cards:batch');
       socket.off('card:delete');
       socket.off('card:moved');
+      socket.off('note:update', onNoteUpdate);
+      socket.off('note:update:ok', onNoteUpdate);
       
       // Clean up socket room when unmounting
       if (currentBoard) {
@@ -131,6 +287,9 @@ export function BoardProvider({ children }: { children: ReactNode }) {
         error,
         setCurrentBoard,
         setCards,
+        columnPages,
+        loadMoreCards,
+        takeSnapshotNote,
         refreshBoards,
         createDemoBoard,
       }}
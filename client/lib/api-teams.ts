@@ -65,8 +65,14 @@ export async function sendInvite(data: { email: string; boardId?: string }) {
   return response.json();
 }
 
-export async function listActivities() {
-  const response = await fetch(`${API_URL}/api/activity`, {
+// Newest first; pass the previous response's nextCursor as `before` for older pages
+export async function listActivities(options: { boardId?: string; before?: string; limit?: number } = {}) {
+  const params = new URLSearchParams();
+  if (options.boardId) params.set('boardId', options.boardId);
+  if (options.before) params.set('before', options.before);
+  if (options.limit) params.set('limit', String(options.limit));
+  const query = params.toString();
+  const response = await fetch(`${API_URL}/api/activity${query ? `?${query}` : ''}`, {
     method: 'GET',
     headers: getHeaders(),
     credentials: 'include',
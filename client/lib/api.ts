@@ -3,6 +3,14 @@ import { getAccessToken } from '@/contexts/AuthContext';
 
 const API_URL = import.meta.env.VITE_API_URL || '';
 
+// Board currently open in the UI; lets the proxy route its mutations to the
+// Node worker that hosts the board's socket room.
+let activeBoardId: string | null = null;
+
+export function setActiveBoard(boardId: string | null) {
+  activeBoardId = boardId;
+}
+
 function getHeaders() {
   const token = getAccessToken();
   const headers: HeadersInit = {
@@ -11,6 +19,9 @@ function getHeaders() {
   if (token) {
     headers['Authorization'] = `Bearer ${token}`;
   }
+  if (activeBoardId) {
+    headers['X-Board-Id'] = activeBoardId;
+  }
   return headers;
 }
 
@@ -35,6 +46,7 @@ export interface Card {
   dueDate?: string;
   tags: string[];
   order: number;
+  version?: number;
   createdAt: string;
   updatedAt: string;
 }
@@ -80,15 +92,72 @@ export async function getBoard(boardId: string) {
   return response.json();
 }
 
+// Lean card listings send user ids plus one `users` map; swap the profiles
+// back in so components can keep reading card.createdBy.name
+function resolveCardUsers<T extends { cards?: any[]; users?: Record<string, any> }>(data: T): T {
+  const users = data.users;
+  if (!users || !data.cards) return data;
+  const profile = (id: any) => (id && users[id]) || id;
+  data.cards = data.cards.map((card) => ({
+    ...card,
+    createdBy: profile(card.createdBy),
+    updatedBy: profile(card.updatedBy),
+  }));
+  return data;
+}
+
+// Per-column totals and the cursor of the next page, for windowed listings
+export interface ColumnPage {
+  count: number;
+  nextCursor: string | null;
+}
+
+// Board, members, cards and note in one request.
+// perColumn limits cards to the first N of each column and adds `columns`.
+export async function getBoardSnapshot(boardId: string, options: { perColumn?: number } = {}) {
+  const query = options.perColumn ? `?perColumn=${options.perColumn}` : '';
+  const response = await fetch(`${API_URL}/api/boards/${boardId}/snapshot${query}`, {
+    method: 'GET',
+    headers: getHeaders(),
+    credentials: 'include',
+  });
+  if (!response.ok) throw new Error('Failed to fetch board');
+  return resolveCardUsers(await response.json());
+}
+
 // Card APIs - fetch all cards for a board
 export async function listCards(boardId: string) {
-  const response = await fetch(`${API_URL}/api/cards/${boardId}/cards`, {
+  const response = await fetch(`${API_URL}/api/cards/${boardId}/cards?view=lean`, {
     method: 'GET',
     headers: getHeaders(),
     credentials: 'include',
   });
   if (!response.ok) throw new Error('Failed to fetch cards');
-  return response.json();
+  return resolveCardUsers(await response.json());
+}
+
+// First `perColumn` cards of every column, with per-column counts and cursors
+export async function listCardWindows(boardId: string, perColumn: number) {
+  const response = await fetch(`${API_URL}/api/cards/${boardId}/cards?perColumn=${perColumn}`, {
+    method: 'GET',
+    headers: getHeaders(),
+    credentials: 'include',
+  });
+  if (!response.ok) throw new Error('Failed to fetch cards');
+  return resolveCardUsers(await response.json());
+}
+
+// Next page of one column, after the cursor returned with the previous page
+export async function listColumnCards(boardId: string, columnId: string, after: string | null, limit: number) {
+  const params = new URLSearchParams({ columnId, limit: String(limit) });
+  if (after) params.set('after', after);
+  const response = await fetch(`${API_URL}/api/cards/${boardId}/cards?${params}`, {
+    method: 'GET',
+    headers: getHeaders(),
+    credentials: 'include',
+  });
+  if (!response.ok) throw new Error('Failed to fetch cards');
+  return resolveCardUsers(await response.json());
 }
 
 export async function createCard(boardId: string, data: Partial<Card>) {
@@ -4,6 +4,8 @@ import { io, Socket } from 'socket.io-client';
 const SOCKET_URL = import.meta.env.VITE_API_URL || window.location.origin;
 
 let socket: Socket | null = null;
+// Node workers behind the proxy, from server:info (null until it arrives)
+let nodeWorkers: number | null = null;
 
 export function getSocket(): Socket {
   if (!socket) {
@@ -23,13 +25,34 @@ export function getSocket(): Socket {
     socket.on('error', (error) => {
       console.error('Socket error:', error);
     });
+
+    socket.on('server:info', (info: { workers?: number }) => {
+      nodeWorkers = Number(info?.workers) || 1;
+    });
   }
   return socket;
 }
 
+// Carry the board id on the handshake so a multi-worker proxy can route
+// every socket of a board room to the same Node process. With a single
+// worker every socket already shares it, so the query only rides along on
+// the next natural reconnect instead of forcing one (and a missed-event gap).
+export function pinSocketToBoard(boardId: string): Socket {
+  const s = getSocket();
+  const query = (s.io.opts.query || {}) as Record<string, string>;
+  if (query.boardId === boardId) return s;
+  s.io.opts.query = { ...query, boardId };
+  if ((s.connected || s.active) && nodeWorkers !== 1) {
+    s.disconnect();
+    s.connect();
+  }
+  return s;
+}
+
 export function disconnectSocket() {
   if (socket) {
     socket.disconnect();
     socket = null;
+    nodeWorkers = null;
   }
 }
@@ -3,6 +3,7 @@ import { CheckCircle2, MessageSquare, UserPlus, Clock, Loader2, User, Trash2, Ed
 import { Avatar, AvatarFallback, AvatarImage } from '@/components/ui/avatar';
 import { listActivities } from '@/lib/api-teams';
 import { getSocket } from '@/lib/socket';
+import { getAccessToken } from '@/contexts/AuthContext';
 import { formatDistanceToNow } from 'date-fns';
 import { motion } from 'framer-motion';
 
@@ -10,6 +11,7 @@ interface Activity {
   _id: string;
   action: string;
   userId: any;
+  userName?: string;
   entityType: string;
   createdAt: string;
 }
@@ -17,18 +19,27 @@ interface Activity {
 export default function Activity() {
   const [activities, setActivities] = useState<Activity[]>([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     loadActivities();
 
-    // Listen for real-time updates
+    // Listen for real-time updates; activities are only broadcast to
+    // board rooms, so opt into this user's feed (again after reconnects)
     const socket = getSocket();
-    socket.on('activity:new', (activity: Activity) => {
+    const subscribe = () => socket.emit('activity:subscribe', { token: getAccessToken() });
+    const onActivity = (activity: Activity) => {
       setActivities((prev) => [activity, ...prev]);
-    });
+    };
+    socket.on('activity:new', onActivity);
+    socket.on('connect', subscribe);
+    if (socket.connected) subscribe();
 
     return () => {
-      socket.off('activity:new');
+      socket.emit('activity:unsubscribe');
+      socket.off('activity:new', onActivity);
+      socket.off('connect', subscribe);
     };
   }, []);
 
@@ -37,6 +48,7 @@ export default function Activity() {
       setLoading(true);
       const data = await listActivities();
       setActivities(data.activities || []);
+      setNextCursor(data.nextCursor || null);
     } catch (err) {
       console.error('Failed to load activities:', err);
     } finally {
@@ -44,6 +56,20 @@ export default function Activity() {
     }
   };
 
+  const loadOlder = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const data = await listActivities({ before: nextCursor });
+      setActivities((prev) => [...prev, ...(data.activities || [])]);
+      setNextCursor(data.nextCursor || null);
+    } catch (err) {
+      console.error('Failed to load older activities:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const getActivityStyle = (action: string) => {
     if (action.includes('created')) {
       return {
@@ -149,7 +175,7 @@ export default function Activity() {
               </motion.div>
             ) : (
               activities.map((activity, index) => {
-                const userName = activity.userId?.name || 'Someone';
+                const userName = activity.userId?.name || activity.userName || 'Someone';
                 const avatarUrl = activity.userId?.avatarUrl;
                 const style = getActivityStyle(activity.action);
                 const Icon = style.icon;
@@ -201,6 +227,15 @@ export default function Activity() {
                 );
               })
             )}
+            {nextCursor && (
+              <button
+                onClick={loadOlder}
+                disabled={loadingMore}
+                className="w-full py-3 rounded-xl bg-white/5 border border-white/10 text-sm text-white/70 hover:bg-white/10 transition-colors disabled:opacity-50"
+              >
+                {loadingMore ? 'Loading...' : 'Load older activity'}
+              </button>
+            )}
           </div>
         )}
       </div>
@@ -28,20 +28,22 @@ export default function NotesEditor() {
     const socket = getSocket();
     socketRef.current = socket;
 
-    socket.on('note:update', (note: any) => {
+    const onNoteUpdate = (note: any) => {
       if (note.boardId === boardId) {
         setValue(note.content || '');
         setSyncing(false);
       }
-    });
-
-    socket.on('note:update:ok', () => {
+    };
+    const onNoteSaved = () => {
       setSyncing(false);
-    });
+    };
+    socket.on('note:update', onNoteUpdate);
+    socket.on('note:update:ok', onNoteSaved);
 
+    // Remove only these handlers; BoardContext listens for note updates too
     return () => {
-      socket.off('note:update');
-      socket.off('note:update:ok');
+      socket.off('note:update', onNoteUpdate);
+      socket.off('note:update:ok', onNoteSaved);
     };
   }, [boardId]);
 
@@ -0,0 +1,158 @@
+import type { Server as IOServer } from "socket.io";
+import { Activity } from "./models/Activity";
+import { emitActivity } from "./realtime";
+
+// Activities are buffered in-process and written with insertMany once the
+// buffer reaches ACTIVITY_FLUSH_SIZE or ACTIVITY_FLUSH_INTERVAL_MS elapses.
+// activity:new is only broadcast for documents that were persisted.
+const ACTIVITY_FLUSH_SIZE = Number(process.env.ACTIVITY_FLUSH_SIZE ?? 200);
+const ACTIVITY_FLUSH_INTERVAL_MS = Number(process.env.ACTIVITY_FLUSH_INTERVAL_MS ?? 250);
+// Failed writes are retried with backoff; beyond this many the oldest are dropped
+const ACTIVITY_RETRY_MAX = Number(process.env.ACTIVITY_RETRY_MAX ?? 10_000);
+const ACTIVITY_RETRY_BACKOFF_MAX_MS = Number(process.env.ACTIVITY_RETRY_BACKOFF_MAX_MS ?? 10_000);
+// How long shutdown waits for buffered activities to be written
+const ACTIVITY_DRAIN_TIMEOUT_MS = Number(process.env.ACTIVITY_DRAIN_TIMEOUT_MS ?? 10_000);
+
+interface QueuedActivity {
+  doc: any;
+  io?: IOServer;
+}
+
+let buffer: QueuedActivity[] = [];
+let retryBuffer: QueuedActivity[] = [];
+let flushTimer: ReturnType<typeof setTimeout> | null = null;
+let flushing = false;
+let retryDelay = ACTIVITY_FLUSH_INTERVAL_MS;
+
+const stats = {
+  enqueued: 0,
+  inserted: 0,
+  dropped: 0,
+  flushes: 0,
+  failedFlushes: 0,
+  lastFlushMs: 0,
+  lastError: null as string | null,
+};
+
+function scheduleFlush(delay: number) {
+  if (flushTimer) return;
+  flushTimer = setTimeout(() => {
+    flushTimer = null;
+    flushActivities();
+  }, delay);
+}
+
+// Queue an activity for writing; returns immediately
+export function enqueueActivity(io: IOServer | undefined, fields: Record<string, unknown>) {
+  // Build the document now so _id and defaults are fixed before any retry
+  const doc = new Activity(fields);
+  const invalid = doc.validateSync();
+  if (invalid) {
+    console.error('Dropping invalid activity:', invalid.message);
+    return;
+  }
+  buffer.push({ doc, io });
+  stats.enqueued++;
+  if (buffer.length >= ACTIVITY_FLUSH_SIZE) {
+    flushActivities();
+  } else {
+    scheduleFlush(ACTIVITY_FLUSH_INTERVAL_MS);
+  }
+}
+
+function requeue(failed: QueuedActivity[]) {
+  retryBuffer = retryBuffer.concat(failed);
+  const overflow = retryBuffer.length - ACTIVITY_RETRY_MAX;
+  if (overflow > 0) {
+    retryBuffer = retryBuffer.slice(overflow);
+    stats.dropped += overflow;
+  }
+}
+
+export async function flushActivities() {
+  if (flushing) return;
+  flushing = true;
+  if (flushTimer) {
+    clearTimeout(flushTimer);
+    flushTimer = null;
+  }
+  // Retries go first so activities stay roughly in order
+  const batch = retryBuffer.concat(buffer.splice(0, ACTIVITY_FLUSH_SIZE));
+  retryBuffer = [];
+  const started = Date.now();
+  let failed: QueuedActivity[] = [];
+  try {
+    if (batch.length) {
+      stats.flushes++;
+      try {
+        await Activity.insertMany(batch.map((item) => item.doc), { ordered: false });
+      } catch (err: any) {
+        stats.failedFlushes++;
+        stats.lastError = err?.message || String(err);
+        const writeErrors: any[] | undefined = err?.writeErrors;
+        if (!writeErrors) {
+          // Nothing is known to have been written (e.g. connection lost)
+          failed = batch;
+        } else {
+          // Duplicate keys are documents a previous attempt already stored
+          const retry = new Set(
+            writeErrors
+              .filter((e) => (e.code ?? e.err?.code) !== 11000)
+              .map((e) => e.index ?? e.err?.index),
+          );
+          failed = batch.filter((_, i) => retry.has(i));
+        }
+      }
+      const failedSet = new Set(failed);
+      for (const item of batch) {
+        if (failedSet.has(item)) continue;
+        stats.inserted++;
+        emitActivity(item.io, item.doc.toJSON());
+      }
+      requeue(failed);
+    }
+  } finally {
+    stats.lastFlushMs = Date.now() - started;
+    flushing = false;
+  }
+
+  if (failed.length) {
+    retryDelay = Math.min(retryDelay * 2, ACTIVITY_RETRY_BACKOFF_MAX_MS);
+    scheduleFlush(retryDelay);
+  } else {
+    retryDelay = ACTIVITY_FLUSH_INTERVAL_MS;
+    if (buffer.length >= ACTIVITY_FLUSH_SIZE) flushActivities();
+    else if (buffer.length || retryBuffer.length) scheduleFlush(ACTIVITY_FLUSH_INTERVAL_MS);
+  }
+}
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// Write everything still buffered, for shutdown. Returns how many
+// activities could not be written before the timeout.
+export async function drainActivities(timeoutMs = ACTIVITY_DRAIN_TIMEOUT_MS) {
+  const deadline = Date.now() + timeoutMs;
+  while ((buffer.length || retryBuffer.length || flushing) && Date.now() < deadline) {
+    if (flushing) {
+      await sleep(10);
+      continue;
+    }
+    const failures = stats.failedFlushes;
+    await flushActivities();
+    if (stats.failedFlushes > failures) await sleep(ACTIVITY_FLUSH_INTERVAL_MS);
+  }
+  if (flushTimer) {
+    clearTimeout(flushTimer);
+    flushTimer = null;
+  }
+  return buffer.length + retryBuffer.length;
+}
+
+export function activityQueueStats() {
+  return {
+    depth: buffer.length,
+    retryDepth: retryBuffer.length,
+    flushing,
+    ...stats,
+  };
+}
@@ -0,0 +1,17 @@
+import { describe, it, expect } from "vitest";
+import { summaryActionKey } from "./activityRetention";
+
+describe("summaryActionKey", () => {
+  it("keeps plain card actions", () => {
+    expect(summaryActionKey("updated")).toBe("updated");
+  });
+
+  it("drops board titles with dots from the key", () => {
+    expect(summaryActionKey('created board "v1.2 release"')).toBe("created");
+  });
+
+  it("never yields keys Mongo maps reject", () => {
+    expect(summaryActionKey("$set.x")).toBe("_set_x");
+    expect(summaryActionKey("")).toBe("other");
+  });
+});
@@ -0,0 +1,162 @@
+import fs from "fs";
+import path from "path";
+import zlib from "zlib";
+import { pipeline } from "stream/promises";
+import { Readable } from "stream";
+import { Activity } from "./models/Activity";
+import { ActivitySummary } from "./models/ActivitySummary";
+
+// Raw board activities older than ACTIVITY_RETENTION_DAYS are rolled up into
+// per-board, per-day ActivitySummary documents and then deleted. Board-less
+// activities (teams) are left alone. ACTIVITY_TTL_DAYS expires every raw row,
+// board ones included, so it must exceed the retention window or rows would
+// vanish before they are rolled up.
+// Off unless ACTIVITY_RETENTION_DAYS is set, since it deletes raw rows.
+const DAY_MS = 24 * 60 * 60 * 1000;
+export const ACTIVITY_RETENTION_DAYS = Number(process.env.ACTIVITY_RETENTION_DAYS || 0);
+const ACTIVITY_COMPACT_INTERVAL_MS = Number(process.env.ACTIVITY_COMPACT_INTERVAL_MS ?? 60 * 60 * 1000);
+// Bounds one run so a large backlog is worked off over several intervals
+const ACTIVITY_COMPACT_MAX_DAYS = Number(process.env.ACTIVITY_COMPACT_MAX_DAYS ?? 30);
+// When set, raw rows are appended to <dir>/activities-YYYY-MM-DD.jsonl.gz before deletion
+const ACTIVITY_ARCHIVE_DIR = process.env.ACTIVITY_ARCHIVE_DIR || "";
+const ACTIVITY_TTL_DAYS = Number(process.env.ACTIVITY_TTL_DAYS || 0);
+
+function startOfUtcDay(date: Date) {
+  return new Date(Date.UTC(date.getUTCFullYear(), date.getUTCMonth(), date.getUTCDate()));
+}
+
+// Activities before this instant are served from summaries (null when disabled)
+export function retentionCutoff(now = new Date()) {
+  if (ACTIVITY_RETENTION_DAYS <= 0) return null;
+  return startOfUtcDay(new Date(now.getTime() - ACTIVITY_RETENTION_DAYS * DAY_MS));
+}
+
+// Summaries count activities by verb: raw actions can embed user text such
+// as `created board "${title}"`, and a "." or leading "$" in a Map key makes
+// the summary unsaveable, which would stall compaction on that day for good
+export function summaryActionKey(action: string) {
+  const verb = String(action).trim().split(/\s+/)[0] || "other";
+  return verb.replace(/\./g, "_").replace(/^\$/, "_");
+}
+
+async function archiveDay(day: Date, range: any) {
+  await fs.promises.mkdir(ACTIVITY_ARCHIVE_DIR, { recursive: true });
+  const file = path.join(ACTIVITY_ARCHIVE_DIR, `activities-${day.toISOString().slice(0, 10)}.jsonl.gz`);
+  const rows = Activity.find(range).sort({ createdAt: 1 }).lean().cursor();
+  const lines = Readable.from(
+    (async function* () {
+      for await (const row of rows) yield JSON.stringify(row) + "\n";
+    })(),
+  );
+  // Appending a new gzip member keeps the file readable with zcat/gunzip
+  await pipeline(lines, zlib.createGzip(), fs.createWriteStream(file, { flags: "a" }));
+}
+
+async function compactDay(day: Date) {
+  const range = { boardId: { $ne: null }, createdAt: { $gte: day, $lt: new Date(day.getTime() + DAY_MS) } };
+  const groups = await Activity.aggregate([
+    { $match: range },
+    {
+      $group: {
+        _id: { boardId: "$boardId", action: "$action", userId: "$userId" },
+        count: { $sum: 1 },
+        userName: { $first: "$userName" },
+        maxId: { $max: "$_id" },
+      },
+    },
+  ]);
+  if (!groups.length) return { boards: 0, rows: 0 };
+
+  const boards = new Map<string, { boardId: any; maxId: any; rows: any[] }>();
+  for (const group of groups) {
+    const key = String(group._id.boardId);
+    const entry = boards.get(key) || { boardId: group._id.boardId, maxId: group.maxId, rows: [] };
+    if (String(group.maxId) > String(entry.maxId)) entry.maxId = group.maxId;
+    entry.rows.push(group);
+    boards.set(key, entry);
+  }
+
+  let rows = 0;
+  for (const { boardId, maxId, rows: boardRows } of boards.values()) {
+    // The same rows always produce the same batch id, so a run that died
+    // between writing the summary and deleting the rows is not counted twice
+    const batchId = String(maxId);
+    const summary =
+      (await ActivitySummary.findOne({ boardId, day })) || new ActivitySummary({ boardId, day });
+    if (summary.appliedBatches.includes(batchId)) continue;
+    for (const row of boardRows) {
+      const action = summaryActionKey(row._id.action);
+      summary.total += row.count;
+      summary.byAction.set(action, (summary.byAction.get(action) || 0) + row.count);
+      const user = summary.byUser.find((u: any) => String(u.userId) === String(row._id.userId));
+      if (user) user.count += row.count;
+      else summary.byUser.push({ userId: row._id.userId, userName: row.userName, count: row.count });
+      rows += row.count;
+    }
+    summary.appliedBatches.push(batchId);
+    await summary.save();
+  }
+
+  if (ACTIVITY_ARCHIVE_DIR) await archiveDay(day, range);
+  await Activity.deleteMany(range);
+  return { boards: boards.size, rows };
+}
+
+export async function compactActivities(now = new Date()) {
+  const cutoff = retentionCutoff(now);
+  if (!cutoff) return { days: 0, rows: 0 };
+  let days = 0;
+  let rows = 0;
+  while (days < ACTIVITY_COMPACT_MAX_DAYS) {
+    const oldest: any = await Activity.findOne(
+      { boardId: { $ne: null }, createdAt: { $lt: cutoff } },
+      { createdAt: 1 },
+    )
+      .sort({ createdAt: 1 })
+      .lean();
+    if (!oldest) break;
+    const result = await compactDay(startOfUtcDay(new Date(oldest.createdAt)));
+    rows += result.rows;
+    days++;
+  }
+  if (days) console.log(`Activity retention: rolled up ${rows} activities from ${days} day(s)`);
+  return { days, rows };
+}
+
+// Turns the {createdAt: 1} index into a TTL index, or updates its expiry.
+// collMod needs MongoDB 5.1+ to convert a plain index; unsetting
+// ACTIVITY_TTL_DAYS leaves an existing TTL in place.
+async function applyActivityTtl() {
+  if (ACTIVITY_TTL_DAYS <= 0) return;
+  if (ACTIVITY_RETENTION_DAYS > 0 && ACTIVITY_TTL_DAYS <= ACTIVITY_RETENTION_DAYS) {
+    console.error("ACTIVITY_TTL_DAYS must exceed ACTIVITY_RETENTION_DAYS; not applying the activity TTL");
+    return;
+  }
+  await Activity.init();
+  await Activity.db.db.command({
+    collMod: Activity.collection.collectionName,
+    index: { keyPattern: { createdAt: 1 }, expireAfterSeconds: ACTIVITY_TTL_DAYS * DAY_MS / 1000 },
+  });
+}
+
+let running = false;
+
+export function startActivityRetention() {
+  // With several Node workers behind the proxy only the first one compacts
+  if ((process.env.NODE_WORKER_INDEX ?? "0") !== "0") return;
+  applyActivityTtl().catch((err) => console.error("Failed to apply activity TTL:", err));
+  if (ACTIVITY_RETENTION_DAYS <= 0) return;
+  const run = async () => {
+    if (running) return;
+    running = true;
+    try {
+      await compactActivities();
+    } catch (err) {
+      console.error("Activity retention failed:", err);
+    } finally {
+      running = false;
+    }
+  };
+  setTimeout(run, 60_000).unref();
+  setInterval(run, ACTIVITY_COMPACT_INTERVAL_MS).unref();
+}
@@ -0,0 +1,66 @@
+"""
+Admission control for the proxy: caps requests in flight to one Node worker
+and queues the rest by priority, shedding what can't be queued.
+"""
+import asyncio
+import heapq
+import itertools
+
+class Overloaded(Exception):
+    """Raised when a request is shed instead of queued"""
+
+class AdmissionController:
+    """Caps in-flight requests to one upstream and queues the rest by priority"""
+
+    def __init__(self, max_in_flight, max_queue):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.waiters = []  # heap of (priority, seq, future)
+        self.seq = itertools.count()
+
+    async def acquire(self, priority, timeout):
+        """Wait for a slot; raises Overloaded or asyncio.TimeoutError"""
+        # A waiter that just timed out or was cancelled may still be queued
+        self._prune()
+        if self.in_flight < self.max_in_flight and not self.waiters:
+            self.in_flight += 1
+            return
+        if len(self.waiters) >= self.max_queue:
+            # A full queue sheds its least important waiter, or the newcomer
+            worst = max(self.waiters)
+            if worst[0] <= priority:
+                raise Overloaded()
+            self.waiters.remove(worst)
+            heapq.heapify(self.waiters)
+            worst[2].set_exception(Overloaded())
+        waiter = (priority, next(self.seq), asyncio.get_running_loop().create_future())
+        heapq.heappush(self.waiters, waiter)
+        try:
+            await asyncio.wait_for(waiter[2], timeout)
+        except BaseException:
+            if waiter in self.waiters:
+                self.waiters.remove(waiter)
+                heapq.heapify(self.waiters)
+            future = waiter[2]
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self.release()  # slot was handed over just as we gave up
+            raise
+
+    def release(self):
+        """Hand the slot to the best waiter, or free it"""
+        while self.waiters:
+            future = heapq.heappop(self.waiters)[2]
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def _prune(self):
+        """Drop waiters whose futures are already settled"""
+        if any(waiter[2].done() for waiter in self.waiters):
+            self.waiters = [waiter for waiter in self.waiters if not waiter[2].done()]
+            heapq.heapify(self.waiters)
+
+    def describe(self):
+        return {'in_flight': self.in_flight, 'queued': len(self.waiters)}
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the proxy's AdmissionController (no Node or Mongo needed)
+
+  python -m pytest server/admission_test.py
+"""
+
+import asyncio
+
+import pytest
+
+from admission import AdmissionController, Overloaded
+
+def run(coro):
+    return asyncio.run(coro)
+
+def test_acquire_under_cap_and_release():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=2, max_queue=4)
+        await controller.acquire(0, 1)
+        await controller.acquire(0, 1)
+        assert controller.describe() == {'in_flight': 2, 'queued': 0}
+        controller.release()
+        controller.release()
+        assert controller.describe() == {'in_flight': 0, 'queued': 0}
+    run(scenario())
+
+def test_release_hands_slot_to_best_waiter():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=4)
+        await controller.acquire(0, 1)
+        order = []
+
+        async def waiter(name, priority):
+            await controller.acquire(priority, 1)
+            order.append(name)
+
+        bulk = asyncio.create_task(waiter('bulk', 2))
+        await asyncio.sleep(0)
+        read = asyncio.create_task(waiter('read', 0))
+        await asyncio.sleep(0)
+        assert controller.describe() == {'in_flight': 1, 'queued': 2}
+
+        controller.release()
+        await read
+        assert order == ['read']
+        controller.release()
+        await bulk
+        assert order == ['read', 'bulk']
+        assert controller.describe() == {'in_flight': 1, 'queued': 0}
+    run(scenario())
+
+def test_full_queue_sheds_newcomer_that_is_not_more_important():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=1)
+        await controller.acquire(0, 1)
+        queued = asyncio.create_task(controller.acquire(1, 1))
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded):
+            await controller.acquire(1, 1)
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+    run(scenario())
+
+def test_full_queue_sheds_less_important_waiter():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=1)
+        await controller.acquire(0, 1)
+        bulk = asyncio.create_task(controller.acquire(2, 1))
+        await asyncio.sleep(0)
+        read = asyncio.create_task(controller.acquire(0, 1))
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded):
+            await bulk
+        controller.release()
+        await read
+        assert controller.describe() == {'in_flight': 1, 'queued': 0}
+    run(scenario())
+
+def test_timeout_leaves_the_queue():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=4)
+        await controller.acquire(0, 1)
+        with pytest.raises(asyncio.TimeoutError):
+            await controller.acquire(0, 0.01)
+        assert controller.describe() == {'in_flight': 1, 'queued': 0}
+        controller.release()
+        assert controller.describe() == {'in_flight': 0, 'queued': 0}
+    run(scenario())
+
+def test_settled_waiter_is_never_picked_for_shedding():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=1)
+        await controller.acquire(0, 1)
+        # A waiter whose wait_for just timed out, not yet removed
+        stale = asyncio.get_running_loop().create_future()
+        stale.cancel()
+        controller.waiters.append((2, -1, stale))
+        queued = asyncio.create_task(controller.acquire(0, 1))
+        await asyncio.sleep(0)
+        assert controller.describe() == {'in_flight': 1, 'queued': 1}
+        controller.release()
+        await queued
+        assert controller.describe() == {'in_flight': 1, 'queued': 0}
+    run(scenario())
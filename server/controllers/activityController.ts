@@ -1,5 +1,61 @@
 import { RequestHandler } from 'express';
+import mongoose from 'mongoose';
 import { Activity } from '../models/Activity';
+import { Board } from '../models/Board';
+import { ActivitySummary } from '../models/ActivitySummary';
+import { retentionCutoff } from '../activityRetention';
+import { getBoardAccess } from '../membership';
+
+const FEED_DEFAULT_LIMIT = 50;
+const FEED_MAX_LIMIT = 200;
+
+// Cursors are "<createdAt ISO>_<_id>" of the last activity on the previous page
+function parseCursor(cursor: unknown) {
+  if (typeof cursor !== 'string' || !cursor) return null;
+  const [when, id] = cursor.split('_');
+  const createdAt = new Date(when);
+  if (isNaN(createdAt.getTime())) return undefined;
+  if (id && !mongoose.Types.ObjectId.isValid(id)) return undefined;
+  return { createdAt, id };
+}
+
+function encodeCursor(activity: any) {
+  return `${new Date(activity.createdAt).toISOString()}_${activity._id}`;
+}
+
+// Keyset condition on (field, _id) for rows older than the cursor
+function olderThan(cursor: { createdAt: Date; id?: string } | null, field: string) {
+  if (!cursor) return {};
+  return {
+    $or: [
+      { [field]: { $lt: cursor.createdAt } },
+      ...(cursor.id ? [{ [field]: cursor.createdAt, _id: { $lt: cursor.id } }] : []),
+    ],
+  };
+}
+
+// Days past the retention window only exist as rollups; present them as feed entries
+function summaryEntry(summary: any) {
+  const actions = Object.entries(summary.byAction || {})
+    .sort((a: any, b: any) => b[1] - a[1])
+    .map(([action, count]) => `${count} ${action}`)
+    .join(', ');
+  return {
+    _id: summary._id,
+    kind: 'summary',
+    boardId: summary.boardId,
+    userName: 'Board activity',
+    action: `${summary.total} changes (${actions})`,
+    entityType: 'board',
+    createdAt: summary.day,
+    summary: { total: summary.total, byAction: summary.byAction, byUser: summary.byUser },
+  };
+}
+
+function newerFirst(a: any, b: any) {
+  const diff = new Date(b.createdAt).getTime() - new Date(a.createdAt).getTime();
+  return diff || (String(b._id) > String(a._id) ? 1 : -1);
+}
 
 export const listActivities: RequestHandler = async (req, res, next) => {
   try {
@@ -7,14 +63,53 @@ export const listActivities: RequestHandler = async (req, res, next) => {
     const userId = anyReq.userId;
     if (!userId) return res.status(401).json({ message: 'Not authenticated' });
 
-    const limit = parseInt(req.query.limit as string) || 50;
-    const activities = await Activity.find()
-      .sort({ createdAt: -1 })
+    const limit = Math.max(1, Math.min(parseInt(req.query.limit as string) || FEED_DEFAULT_LIMIT, FEED_MAX_LIMIT));
+    const boardId = req.query.boardId as string | undefined;
+    const cursor = parseCursor(req.query.before);
+    if (cursor === undefined) return res.status(400).json({ message: 'Invalid cursor' });
+
+    // Only boards the user belongs to; without a boardId, all of them plus
+    // the user's own board-less activities (teams etc.)
+    let boardScope: any;
+    let scope: any;
+    if (boardId) {
+      if (!mongoose.Types.ObjectId.isValid(boardId))
+        return res.status(400).json({ message: 'Invalid boardId' });
+      const access = await getBoardAccess(userId, boardId);
+      if (!access.role) return res.status(403).json({ message: 'Not a board member' });
+      boardScope = { boardId };
+      scope = boardScope;
+    } else {
+      const boards = await Board.find(
+        { $or: [{ ownerId: userId }, { 'members.userId': userId }] },
+        { _id: 1 }
+      ).lean();
+      boardScope = { boardId: { $in: boards.map((b: any) => b._id) } };
+      scope = { $or: [boardScope, { userId, boardId: null }] };
+    }
+
+    const filter: any = cursor ? { $and: [scope, olderThan(cursor, 'createdAt')] } : scope;
+    let activities: any[] = await Activity.find(filter)
+      .sort({ createdAt: -1, _id: -1 })
       .limit(limit)
       .populate('userId', 'name email avatarUrl')
       .lean();
 
-    res.json({ activities });
+    // Pages that reach past the retention window continue with daily rollups
+    const last = activities[activities.length - 1];
+    const cutoff = retentionCutoff();
+    if (!last || activities.length < limit || (cutoff && new Date(last.createdAt) < cutoff)) {
+      const summaries = await ActivitySummary.find({ ...boardScope, ...olderThan(cursor, 'day') })
+        .sort({ day: -1, _id: -1 })
+        .limit(limit)
+        .lean();
+      if (summaries.length) {
+        activities = [...activities, ...summaries.map(summaryEntry)].sort(newerFirst).slice(0, limit);
+      }
+    }
+
+    const nextCursor = activities.length === limit ? encodeCursor(activities[activities.length - 1]) : null;
+    res.json({ activities, nextCursor });
   } catch (err) {
     next(err);
   }
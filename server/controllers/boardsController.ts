@@ -2,6 +2,10 @@ import { RequestHandler } from "express";
 import { Board } from "../models/Board";
 import { Note } from "../models/Note";
 import mongoose from "mongoose";
+import { subscribeUserToBoard } from "../realtime";
+import { enqueueActivity } from "../activityQueue";
+import { invalidateMembership } from "../membership";
+import { cardListOptions, loadBoardCards } from "./cardsController";
 
 export const createBoard: RequestHandler = async (req, res, next) => {
   try {
@@ -24,9 +28,12 @@ export const createBoard: RequestHandler = async (req, res, next) => {
     // create an empty note for the board
     await Note.create({ boardId: board._id, content: "" });
 
+    // Let the owner's open activity feed follow the new board
+    const io = (req as any).app.get('io');
+    subscribeUserToBoard(io, ownerId, board._id);
+
     // Create activity
-    const { Activity } = await import('../models/Activity');
-    await Activity.create({
+    enqueueActivity(io, {
       userId: ownerId,
       action: `created board "${title}"`,
       entityType: 'board',
@@ -70,6 +77,26 @@ export const getBoard: RequestHandler = async (req, res, next) => {
   }
 };
 
+// Everything the board view needs in one response: the board (columns and
+// members with profiles), cards (lean listing plus users map) and the note,
+// queried in parallel. The activity feed is paged separately.
+export const getBoardSnapshot: RequestHandler = async (req, res, next) => {
+  try {
+    const { id } = req.params;
+    if (!mongoose.Types.ObjectId.isValid(id))
+      return res.status(400).json({ message: "Invalid id" });
+    const [board, note, cardData] = await Promise.all([
+      Board.findById(id).populate("members.userId", "name email avatarUrl").lean(),
+      Note.findOne({ boardId: id }).lean(),
+      loadBoardCards(id, { ...cardListOptions(req.query), lean: true }),
+    ]);
+    if (!board) return res.status(404).json({ message: "Board not found" });
+    res.json({ board, ...cardData, note });
+  } catch (err) {
+    next(err);
+  }
+};
+
 export const inviteMember: RequestHandler = async (req, res, next) => {
   try {
     const { id } = req.params; // board id
@@ -81,6 +108,7 @@ export const inviteMember: RequestHandler = async (req, res, next) => {
     // add member
     board.members.push({ userId, role: role || "viewer" });
     await board.save();
+    invalidateMembership(board._id, userId);
     res.json({ ok: true });
   } catch (err) {
     next(err);
@@ -1,18 +1,185 @@
 import { RequestHandler } from "express";
 import { Card } from "../models/Card";
-import { Activity } from "../models/Activity";
+import { User } from "../models/User";
 import mongoose from "mongoose";
+import { dropCardPatch, emitToBoard, queueCardPatch } from "../realtime";
+import { enqueueActivity } from "../activityQueue";
+import { getUserProfile, UserProfile } from "../userProfiles";
+
+// Fields a card:patch may carry; history and the creator never change on update
+const PATCH_FIELDS = [
+  'columnId', 'title', 'description', 'assigneeId', 'dueDate', 'tags', 'order', 'updatedBy', 'updatedAt',
+];
+
+// Field-level diff between two stored versions of a card. Values are the new
+// state; removed fields are sent as null.
+function cardPatch(oldCard: any, card: any, updater: UserProfile | null) {
+  const changes: Record<string, unknown> = {};
+  for (const field of PATCH_FIELDS) {
+    const after = card.get(field);
+    if (JSON.stringify(oldCard.get(field)) === JSON.stringify(after)) continue;
+    // The client renders the updater's profile, not just the id
+    changes[field] = field === 'updatedBy' ? (updater || after) : (after ?? null);
+  }
+  return {
+    _id: card._id,
+    boardId: card.boardId,
+    baseVersion: oldCard.version,
+    version: card.version,
+    changes,
+  };
+}
+
+// Same shape as populating createdBy/updatedBy, from the profile cache
+function withProfiles(card: any, creator: UserProfile | null, updater: UserProfile | null) {
+  return {
+    ...card.toJSON(),
+    createdBy: creator || card.createdBy,
+    updatedBy: updater || card.updatedBy,
+  };
+}
+
+// Queue the activity; it is written and broadcast after the response
+function logCardActivity(io: any, userId: string, action: string, card: any) {
+  getUserProfile(userId)
+    .then((user) =>
+      enqueueActivity(io, {
+        userId,
+        userName: user?.name || 'Unknown User',
+        userAvatar: user?.avatarUrl,
+        boardId: card.boardId,
+        action,
+        entityType: 'card',
+        entityId: card._id.toString(),
+        entityTitle: card.title,
+        description: `${user?.name || 'Someone'} ${action} card "${card.title}"`,
+        timestamp: new Date(),
+      }),
+    )
+    .catch((activityErr) => console.error('Failed to log activity:', activityErr));
+}
+
+// Fields returned by the lean listing; history only on request
+const LEAN_CARD_FIELDS =
+  'boardId columnId title description assigneeId createdBy updatedBy dueDate tags order version createdAt updatedAt';
+
+const CARD_PAGE_MAX = 500;
+
+export interface CardListOptions {
+  // Plain objects with user ids plus one `users` map instead of populated documents
+  lean?: boolean;
+  history?: boolean;
+  // First N cards of every column plus per-column counts and cursors (lean only)
+  perColumn?: number;
+}
+
+// Cursors are "<order>_<_id>" of the last card of the previous page
+function parseCardCursor(cursor: unknown) {
+  if (typeof cursor !== 'string' || !cursor) return null;
+  const [order, id] = cursor.split('_');
+  if (isNaN(Number(order)) || !mongoose.Types.ObjectId.isValid(id)) return undefined;
+  return { order: Number(order), id };
+}
+
+const encodeCardCursor = (card: any) => `${card.order}_${card._id}`;
+
+function pageLimit(value: unknown, fallback: number) {
+  const limit = parseInt(value as string) || fallback;
+  return Math.max(1, Math.min(limit, CARD_PAGE_MAX));
+}
+
+async function userMap(cards: any[]) {
+  const userIds = new Set<string>();
+  for (const card of cards) {
+    if (card.createdBy) userIds.add(String(card.createdBy));
+    if (card.updatedBy) userIds.add(String(card.updatedBy));
+    if (card.assigneeId) userIds.add(String(card.assigneeId));
+  }
+  const users: any[] = userIds.size
+    ? await User.find({ _id: { $in: [...userIds] } }, 'name email avatarUrl').lean()
+    : [];
+  return Object.fromEntries(users.map((user) => [String(user._id), user]));
+}
+
+// One keyset page of a column, walking the {boardId, columnId, order} index
+async function findColumnPage(boardId: string, columnId: string, fields: string, after: any, limit: number) {
+  const filter: any = { boardId, columnId };
+  if (after) {
+    filter.$or = [{ order: { $gt: after.order } }, { order: after.order, _id: { $gt: after.id } }];
+  }
+  const page: any[] = await Card.find(filter, fields).sort({ order: 1, _id: 1 }).limit(limit + 1).lean();
+  const hasMore = page.length > limit;
+  if (hasMore) page.pop();
+  return { cards: page, nextCursor: hasMore ? encodeCardCursor(page[page.length - 1]) : null };
+}
+
+// Per-column card counts, answered from the index alone
+async function columnCounts(boardId: string) {
+  const rows = await Card.aggregate([
+    { $match: { boardId: new mongoose.Types.ObjectId(boardId) } },
+    { $group: { _id: '$columnId', count: { $sum: 1 } } },
+  ]);
+  return rows.map((row) => ({ columnId: String(row._id), count: row.count }));
+}
+
+// Shared by listCards and the board snapshot
+export async function loadBoardCards(boardId: string, options: CardListOptions = {}) {
+  if (!options.lean) {
+    const cards = await Card.find({ boardId })
+      .populate('createdBy', 'name email avatarUrl')
+      .populate('updatedBy', 'name email avatarUrl')
+      .sort({ order: 1 });
+    return { cards };
+  }
+
+  const fields = options.history ? `${LEAN_CARD_FIELDS} history` : LEAN_CARD_FIELDS;
+  if (options.perColumn) {
+    const counts = await columnCounts(boardId);
+    const pages = await Promise.all(
+      counts.map(({ columnId }) => findColumnPage(boardId, columnId, fields, null, options.perColumn!)),
+    );
+    const cards = pages.flatMap((page) => page.cards);
+    const columns: Record<string, { count: number; nextCursor: string | null }> = {};
+    counts.forEach(({ columnId, count }, i) => {
+      columns[columnId] = { count, nextCursor: pages[i].nextCursor };
+    });
+    return { cards, users: await userMap(cards), columns };
+  }
+
+  const cards: any[] = await Card.find({ boardId }, fields).sort({ order: 1 }).lean();
+  return { cards, users: await userMap(cards) };
+}
+
+// ?view=lean selects the lean listing, ?history=1 adds card history to it and
+// ?perColumn=N windows it to the first N cards of each column
+export function cardListOptions(query: any): CardListOptions {
+  return {
+    lean: query.view === 'lean' || !!query.perColumn,
+    history: query.history === '1' || query.history === 'true',
+    perColumn: query.perColumn ? pageLimit(query.perColumn, 50) : undefined,
+  };
+}
 
 export const listCards: RequestHandler = async (req, res, next) => {
   try {
     const { boardId } = req.params;
     if (!mongoose.Types.ObjectId.isValid(boardId))
       return res.status(400).json({ message: "Invalid boardId" });
-    const cards = await Card.find({ boardId })
-      .populate('createdBy', 'name email avatarUrl')
-      .populate('updatedBy', 'name email avatarUrl')
-      .sort({ order: 1 });
-    res.json({ cards });
+
+    // ?columnId=&after=&limit= pages through one column (always lean)
+    const columnId = req.query.columnId as string | undefined;
+    if (columnId) {
+      if (!mongoose.Types.ObjectId.isValid(columnId))
+        return res.status(400).json({ message: "Invalid columnId" });
+      const after = parseCardCursor(req.query.after);
+      if (after === undefined) return res.status(400).json({ message: "Invalid cursor" });
+      const options = cardListOptions(req.query);
+      const fields = options.history ? `${LEAN_CARD_FIELDS} history` : LEAN_CARD_FIELDS;
+      const page = await findColumnPage(boardId, columnId, fields, after, pageLimit(req.query.limit, 50));
+      return res.json({ columnId, ...page, users: await userMap(page.cards) });
+    }
+
+    res.json(await loadBoardCards(boardId, cardListOptions(req.query)));
   } catch (err) {
     next(err);
   }
@@ -24,58 +191,30 @@ export const createCard: RequestHandler = async (req, res, next) => {
     const { columnId, title, description, assigneeId, dueDate, tags } = req.body;
     const userId = (req as any).userId;
     
-    const card = await Card.create({
-      boardId,
-      columnId,
-      title,
-      description,
-      assigneeId,
-      createdBy: userId,
-      updatedBy: userId,
-      dueDate,
-      tags: tags || [],
-      order: Date.now(),
-      history: [],
-    });
-
-    // Populate user data before broadcasting
-    const populatedCard = await Card.findById(card._id)
-      .populate('createdBy', 'name email avatarUrl')
-      .populate('updatedBy', 'name email avatarUrl');
+    const [card, user] = await Promise.all([
+      Card.create({
+        boardId,
+        columnId,
+        title,
+        description,
+        assigneeId,
+        createdBy: userId,
+        updatedBy: userId,
+        dueDate,
+        tags: tags || [],
+        order: Date.now(),
+        history: [],
+      }),
+      getUserProfile(userId),
+    ]);
+    const populatedCard = withProfiles(card, user, user);
 
-    // Broadcast card creation to all clients
+    // Broadcast card creation to the board room
     const io = (req as any).app.get('io');
-    if (io) {
-      io.emit('card:create', populatedCard);
-    }
+    emitToBoard(io, boardId, 'card:create', populatedCard);
+    logCardActivity(io, userId, 'created', card);
 
-    // Log activity
-    try {
-      const { User } = await import('../models/User');
-      const user = await User.findById(userId);
-      
-      const activity = await Activity.create({
-        userId,
-        userName: user?.name || 'Unknown User',
-        userAvatar: user?.avatarUrl,
-        boardId,
-        action: 'created',
-        entityType: 'card',
-        entityId: card._id.toString(),
-        entityTitle: title,
-        description: `${user?.name || 'Someone'} created card "${title}"`,
-        timestamp: new Date(),
-      });
-      
-      // Emit real-time activity update
-      if (io) {
-        io.emit('activity:new', activity);
-      }
-    } catch (activityErr) {
-      console.error('Failed to log activity:', activityErr);
-    }
-
-    res.status(201).json({ card: populatedCard || card });
+    res.status(201).json({ card: populatedCard });
   } catch (err) {
     next(err);
   }
@@ -89,50 +228,40 @@ export const updateCard: RequestHandler = async (req, res, next) => {
     if (!mongoose.Types.ObjectId.isValid(id))
       return res.status(400).json({ message: "Invalid id" });
     
-    const oldCard = await Card.findById(id);
-    const updateData = { ...req.body, updatedBy: userId };
-    const card = await Card.findByIdAndUpdate(id, updateData, { new: true });
+    // Express 5 leaves req.body undefined without a JSON body
+    const body = req.body ?? {};
+    if (typeof body !== "object" || Array.isArray(body))
+      return res.status(400).json({ message: "Invalid body" });
+    const { version: _clientVersion, ...fields } = body;
+    if (Object.keys(fields).length === 0)
+      return res.status(400).json({ message: "No fields to update" });
+    const changes = { ...fields, updatedBy: userId, updatedAt: new Date() };
+    // One atomic update returning the pre-image; the post-image is that
+    // document with the same changes applied, so both match what was stored
+    const oldCard = await Card.findByIdAndUpdate(
+      id,
+      { ...changes, $inc: { version: 1 } },
+      { new: false, timestamps: false },
+    );
+    if (!oldCard) return res.json({ card: null });
+    const card = Card.hydrate(oldCard.toObject());
+    card.set(changes);
+    card.version = oldCard.version + 1;
 
-    // Populate user data before broadcasting
-    const populatedCard = await Card.findById(id)
-      .populate('createdBy', 'name email avatarUrl')
-      .populate('updatedBy', 'name email avatarUrl');
+    const [creator, updater] = await Promise.all([
+      getUserProfile(card.createdBy),
+      getUserProfile(userId),
+    ]);
 
-    // Broadcast card update to all clients
+    // Broadcast only the changed fields to the board room, coalesced with
+    // other patches to the same card in this batch window
     const io = (req as any).app.get('io');
-    if (io && populatedCard) {
-      io.emit('card:update', populatedCard);
-    }
+    queueCardPatch(io, card.boardId, cardPatch(oldCard, card, updater));
+    logCardActivity(io, userId, 'updated', card);
 
-    // Log activity
-    if (card && oldCard) {
-      try {
-        const { User } = await import('../models/User');
-        const user = await User.findById(userId);
-        
-        const activity = await Activity.create({
-          userId,
-          userName: user?.name || 'Unknown User',
-          userAvatar: user?.avatarUrl,
-          boardId: card.boardId,
-          action: 'updated',
-          entityType: 'card',
-          entityId: card._id.toString(),
-          entityTitle: card.title,
-          description: `${user?.name || 'Someone'} updated card "${card.title}"`,
-          timestamp: new Date(),
-        });
-        
-        // Emit real-time activity update
-        if (io) {
-          io.emit('activity:new', activity);
-        }
-      } catch (activityErr) {
-        console.error('Failed to log activity:', activityErr);
-      }
-    }
-
-    res.json({ card: populatedCard || card });
+    // Tells the proxy which board's cached reads this write invalidates
+    res.set('X-Board-Id', String(card.boardId));
+    res.json({ card: withProfiles(card, creator, updater) });
   } catch (err) {
     next(err);
   }
@@ -146,41 +275,15 @@ export const deleteCard: RequestHandler = async (req, res, next) => {
     if (!mongoose.Types.ObjectId.isValid(id))
       return res.status(400).json({ message: "Invalid id" });
     
-    const card = await Card.findById(id);
-    await Card.findByIdAndDelete(id);
+    const card = await Card.findByIdAndDelete(id).select('boardId columnId title');
 
-    // Broadcast card deletion to all clients
+    // Broadcast card deletion to the board room
     const io = (req as any).app.get('io');
-    if (io && card) {
-      io.emit('card:delete', { id: card._id });
-    }
-
-    // Log activity
     if (card) {
-      try {
-        const { User } = await import('../models/User');
-        const user = await User.findById(userId);
-        
-        const activity = await Activity.create({
-          userId,
-          userName: user?.name || 'Unknown User',
-          userAvatar: user?.avatarUrl,
-          boardId: card.boardId,
-          action: 'deleted',
-          entityType: 'card',
-          entityId: card._id.toString(),
-          entityTitle: card.title,
-          description: `${user?.name || 'Someone'} deleted card "${card.title}"`,
-          timestamp: new Date(),
-        });
-        
-        // Emit real-time activity update
-        if (io) {
-          io.emit('activity:new', activity);
-        }
-      } catch (activityErr) {
-        console.error('Failed to log activity:', activityErr);
-      }
+      dropCardPatch(card.boardId, card._id);
+      emitToBoard(io, card.boardId, 'card:delete', { id: card._id, columnId: card.columnId });
+      logCardActivity(io, userId, 'deleted', card);
+      res.set('X-Board-Id', String(card.boardId));
     }
 
     res.json({ ok: true });
@@ -1,6 +1,7 @@
 import { RequestHandler } from "express";
 import jwt from "jsonwebtoken";
 import { User } from "../models/User";
+import { invalidateUserProfile } from "../userProfiles";
 
 const ACCESS_SECRET = process.env.JWT_ACCESS_SECRET || "emergent_flowspace_access_secret_" + Date.now();
 const REFRESH_SECRET = process.env.JWT_REFRESH_SECRET || "emergent_flowspace_refresh_secret_" + Date.now();
@@ -33,6 +34,7 @@ export const firebaseLogin: RequestHandler = async (req, res, next) => {
       if (photoURL && user.avatarUrl !== photoURL) {
         user.avatarUrl = photoURL;
         await user.save();
+        invalidateUserProfile(user._id);
       }
     }
 
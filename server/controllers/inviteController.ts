@@ -3,6 +3,10 @@ import nodemailer from 'nodemailer';
 import crypto from 'crypto';
 import { Invite } from '../models/Invite';
 import { Board } from '../models/Board';
+import { emitToBoard, subscribeUserToBoard } from '../realtime';
+import { enqueueActivity } from '../activityQueue';
+import { getUserProfile } from '../userProfiles';
+import { getBoardAccess, hasRole, invalidateMembership } from '../membership';
 
 const transporter = nodemailer.createTransport({
   service: 'gmail',
@@ -29,17 +33,14 @@ export const sendInvite: RequestHandler = async (req, res, next) => {
     if (!boardId) return res.status(400).json({ message: 'Board ID required' });
 
     // Verify board exists and user has permission
-    const board = await Board.findById(boardId);
-    if (!board) return res.status(404).json({ message: 'Board not found' });
-    
-    const isOwner = board.ownerId.toString() === userId;
-    const isMember = board.members.some(
-      (m: any) => m.userId.toString() === userId && (m.role === 'owner' || m.role === 'editor')
-    );
-    
-    if (!isOwner && !isMember) {
+    const access = await getBoardAccess(userId, boardId);
+    if (!access.exists) return res.status(404).json({ message: 'Board not found' });
+    if (!hasRole(access, 'editor')) {
       return res.status(403).json({ message: 'No permission to invite' });
     }
+    // Only the title is needed, for the email
+    const board = await Board.findById(boardId, 'title');
+    if (!board) return res.status(404).json({ message: 'Board not found' });
 
     // Check if invite already exists
     let invite = await Invite.findOne({ boardId, email, status: 'pending' });
@@ -226,22 +227,27 @@ export const acceptInvite: RequestHandler = async (req, res, next) => {
         role: invite.role as any,
       });
       await board.save();
+      invalidateMembership(board._id, userId);
     }
 
     // Mark invite as accepted
     invite.status = 'accepted';
     await invite.save();
 
-    // Log activity for invite acceptance
-    const { Activity } = await import('../models/Activity');
-    const { User } = await import('../models/User');
-    const user = await User.findById(userId);
-    
+    // Emit socket event to notify board members
+    const io = (req as any).app.get('io');
+    emitToBoard(io, board._id, 'board:member-joined', { boardId: board._id, userId });
+    // The new member's feed, if subscribed, now includes this board
+    subscribeUserToBoard(io, userId, board._id);
+
+    // Log activity for invite acceptance; activity:new follows once it is stored
+    const user = await getUserProfile(userId);
     if (user) {
-      await Activity.create({
+      enqueueActivity(io, {
         userId,
         userName: user.name,
         userAvatar: user.avatarUrl,
+        boardId: board._id,
         action: 'joined',
         entityType: 'board',
         entityId: board._id.toString(),
@@ -251,18 +257,6 @@ export const acceptInvite: RequestHandler = async (req, res, next) => {
       });
     }
 
-    // Emit socket event to notify board members
-    const io = (req as any).app.get('io');
-    if (io) {
-      io.emit('board:member-joined', { boardId: board._id, userId });
-      // Emit activity update
-      io.emit('activity:new', {
-        userId,
-        boardId: board._id.toString(),
-        action: 'joined',
-      });
-    }
-
     res.json({ 
       success: true, 
       message: 'Invite accepted',
@@ -288,11 +282,9 @@ export const listInvites: RequestHandler = async (req, res, next) => {
     const { boardId } = req.params;
     
     // Verify user has permission
-    const board = await Board.findById(boardId);
-    if (!board) return res.status(404).json({ message: 'Board not found' });
-    
-    const isOwner = board.ownerId.toString() === userId;
-    if (!isOwner) {
+    const access = await getBoardAccess(userId, boardId);
+    if (!access.exists) return res.status(404).json({ message: 'Board not found' });
+    if (access.role !== 'owner') {
       return res.status(403).json({ message: 'Only board owner can view invites' });
     }
 
@@ -1,6 +1,7 @@
 import { RequestHandler } from 'express';
 import { Team } from '../models/Team';
 import mongoose from 'mongoose';
+import { enqueueActivity } from '../activityQueue';
 
 export const createTeam: RequestHandler = async (req, res, next) => {
   try {
@@ -17,8 +18,7 @@ export const createTeam: RequestHandler = async (req, res, next) => {
     });
 
     // Create activity
-    const { Activity } = await import('../models/Activity');
-    await Activity.create({
+    enqueueActivity((req as any).app.get('io'), {
       userId: ownerId,
       action: `created team \"${name}\"`,
       entityType: 'team',
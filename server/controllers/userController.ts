@@ -2,6 +2,7 @@ import { RequestHandler } from 'express';
 import { User } from '../models/User';
 import bcrypt from 'bcrypt';
 import mongoose from 'mongoose';
+import { invalidateUserProfile } from '../userProfiles';
 
 export const updateProfile: RequestHandler = async (req, res, next) => {
   try {
@@ -17,6 +18,7 @@ export const updateProfile: RequestHandler = async (req, res, next) => {
 
     const user = await User.findByIdAndUpdate(userId, updates, { new: true }).select('-password');
     if (!user) return res.status(404).json({ message: 'User not found' });
+    invalidateUserProfile(userId);
 
     res.json({ user });
   } catch (err) {
@@ -31,6 +33,7 @@ export const deleteAccount: RequestHandler = async (req, res, next) => {
     if (!userId) return res.status(401).json({ message: 'Not authenticated' });
 
     await User.findByIdAndDelete(userId);
+    invalidateUserProfile(userId);
     res.clearCookie('refreshToken');
     res.json({ success: true, message: 'Account deleted' });
   } catch (err) {
@@ -62,6 +65,7 @@ export const uploadAvatar: RequestHandler = async (req, res, next) => {
     ).select('-password');
 
     if (!user) return res.status(404).json({ message: 'User not found' });
+    invalidateUserProfile(userId);
 
     res.json({ user, avatarUrl, success: true });
   } catch (err) {
@@ -17,6 +17,8 @@ import userRoutes from "./routes/user";
 import { handleDemo } from "./routes/demo";
 import { errorHandler } from "./middleware/errorHandler";
 import { initSocket } from "./socket";
+import { authMiddleware, tokenCacheStats } from "./middleware/authMiddleware";
+import { activityQueueStats } from "./activityQueue";
 
 export async function createServer(opts: { connectDB?: boolean } = {}) {
   const { connectDB = true } = opts;
@@ -55,6 +57,11 @@ export async function createServer(opts: { connectDB?: boolean } = {}) {
 
   app.get("/api/demo", handleDemo);
 
+  // In-process cache and activity write-queue counters for monitoring
+  app.get("/api/stats", authMiddleware, (_req, res) => {
+    res.json({ tokenCache: tokenCacheStats(), activityQueue: activityQueueStats() });
+  });
+
   app.use("/api/auth", authRoutes);
   app.use("/api/boards", boardsRoutes);
   app.use("/api/cards", cardsRoutes);
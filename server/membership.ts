@@ -0,0 +1,90 @@
+import mongoose from "mongoose";
+import { Board, Role } from "./models/Board";
+
+// (boardId, userId) -> role, cached per process so authorizing a request does
+// not load the whole board. Member changes invalidate the entries they touch;
+// the TTL bounds staleness for changes made through another Node worker.
+const MEMBERSHIP_CACHE_TTL_MS = Number(process.env.MEMBERSHIP_CACHE_TTL_MS ?? 30_000);
+const MEMBERSHIP_CACHE_MAX = Number(process.env.MEMBERSHIP_CACHE_MAX ?? 50_000);
+
+const ROLE_RANK: Record<Role, number> = { viewer: 1, editor: 2, owner: 3 };
+
+export interface BoardAccess {
+  // false when the board does not exist
+  exists: boolean;
+  // null when the user is not a member
+  role: Role | null;
+}
+
+const entries = new Map<string, { access: BoardAccess; expires: number }>();
+const inflight = new Map<string, Promise<BoardAccess>>();
+
+const cacheKey = (boardId: unknown, userId: unknown) => `${boardId}:${userId}`;
+
+async function loadAccess(boardId: string, userId: string): Promise<BoardAccess> {
+  // Only the owner id and the caller's own member entry come back;
+  // projection values are not cast, so the id is converted here
+  const memberId = mongoose.Types.ObjectId.isValid(userId) ? new mongoose.Types.ObjectId(userId) : null;
+  const board: any = await Board.findOne(
+    { _id: boardId },
+    { ownerId: 1, members: { $elemMatch: { userId: memberId } } },
+  ).lean();
+  if (!board) return { exists: false, role: null };
+  if (String(board.ownerId) === userId) return { exists: true, role: "owner" };
+  return { exists: true, role: board.members?.[0]?.role || null };
+}
+
+export async function getBoardAccess(userId: unknown, boardId: unknown): Promise<BoardAccess> {
+  if (!userId || !mongoose.Types.ObjectId.isValid(String(boardId))) {
+    return { exists: false, role: null };
+  }
+  const key = cacheKey(boardId, userId);
+  const cached = entries.get(key);
+  if (cached && cached.expires > Date.now()) {
+    entries.delete(key);
+    entries.set(key, cached);
+    return cached.access;
+  }
+  let pending = inflight.get(key);
+  if (!pending) {
+    const load: Promise<BoardAccess> = loadAccess(String(boardId), String(userId))
+      .then((access) => {
+        // Invalidated while the query ran: the role may predate the change
+        if (inflight.get(key) !== load) return access;
+        entries.delete(key);
+        entries.set(key, { access, expires: Date.now() + MEMBERSHIP_CACHE_TTL_MS });
+        while (entries.size > MEMBERSHIP_CACHE_MAX) {
+          entries.delete(entries.keys().next().value as string);
+        }
+        return access;
+      })
+      .finally(() => {
+        if (inflight.get(key) === load) inflight.delete(key);
+      });
+    inflight.set(key, load);
+    pending = load;
+  }
+  return pending;
+}
+
+export function hasRole(access: BoardAccess, minRole: Role) {
+  return !!access.role && ROLE_RANK[access.role] >= ROLE_RANK[minRole];
+}
+
+// Call after adding, removing or re-roling members; without a userId every
+// cached entry of the board is dropped. Loads already in flight are detached
+// too, so they cannot write the old role back.
+export function invalidateMembership(boardId: unknown, userId?: unknown) {
+  if (userId) {
+    const key = cacheKey(boardId, userId);
+    entries.delete(key);
+    inflight.delete(key);
+    return;
+  }
+  const prefix = `${boardId}:`;
+  for (const cache of [entries, inflight]) {
+    for (const key of cache.keys()) {
+      if (key.startsWith(prefix)) cache.delete(key);
+    }
+  }
+}
@@ -1,8 +1,52 @@
 import { RequestHandler } from "express";
 import jwt from "jsonwebtoken";
+import crypto from "crypto";
 
 const ACCESS_SECRET = process.env.JWT_ACCESS_SECRET || "emergent_flowspace_access_secret_" + Date.now();
 
+// Recently verified tokens, keyed by SHA-256 of the token, so repeat requests
+// skip the HMAC check. Entries never outlive the token's own exp.
+const TOKEN_CACHE_MAX = Number(process.env.TOKEN_CACHE_MAX ?? 10_000);
+// Upper bound for tokens signed without an exp
+const TOKEN_CACHE_MAX_AGE_MS = Number(process.env.TOKEN_CACHE_MAX_AGE_MS ?? 5 * 60 * 1000);
+
+const verifiedTokens = new Map<string, { sub: string; expiresAt: number }>();
+const tokenCacheCounters = { hits: 0, misses: 0, expired: 0, evicted: 0 };
+
+export function tokenCacheStats() {
+  return { size: verifiedTokens.size, max: TOKEN_CACHE_MAX, ...tokenCacheCounters };
+}
+
+// Returns the user id of a valid access token, throws otherwise
+export function verifyAccessToken(token: string): string {
+  const digest = crypto.createHash("sha256").update(token).digest("hex");
+  const cached = verifiedTokens.get(digest);
+  if (cached) {
+    // jwt.verify rejects once now >= exp; expiresAt is exp in ms
+    if (Date.now() < cached.expiresAt) {
+      tokenCacheCounters.hits++;
+      verifiedTokens.delete(digest);
+      verifiedTokens.set(digest, cached);
+      return cached.sub;
+    }
+    tokenCacheCounters.expired++;
+    verifiedTokens.delete(digest);
+  }
+  tokenCacheCounters.misses++;
+
+  const payload: any = jwt.verify(token, ACCESS_SECRET);
+  const maxAge = Date.now() + TOKEN_CACHE_MAX_AGE_MS;
+  verifiedTokens.set(digest, {
+    sub: payload.sub,
+    expiresAt: typeof payload.exp === "number" ? Math.min(payload.exp * 1000, maxAge) : maxAge,
+  });
+  while (verifiedTokens.size > TOKEN_CACHE_MAX) {
+    verifiedTokens.delete(verifiedTokens.keys().next().value as string);
+    tokenCacheCounters.evicted++;
+  }
+  return payload.sub;
+}
+
 export const authMiddleware: RequestHandler = (req, res, next) => {
   try {
     const auth = req.headers.authorization;
@@ -12,8 +56,7 @@ export const authMiddleware: RequestHandler = (req, res, next) => {
     if (parts.length !== 2 || parts[0] !== "Bearer")
       return res.status(401).json({ message: "Invalid authorization format" });
     const token = parts[1];
-    const payload: any = jwt.verify(token, ACCESS_SECRET);
-    (req as any).userId = payload.sub;
+    (req as any).userId = verifyAccessToken(token);
     next();
   } catch (err) {
     return res.status(401).json({ message: "Invalid or expired token" });
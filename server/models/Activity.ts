@@ -36,6 +36,14 @@ const ActivitySchema = new Schema<IActivity>(
   { timestamps: true }
 );
 
+// Feed queries: newest first per board, and a user's board-less activities.
+// _id matches the feed's tie-break so the index supplies the whole sort.
+ActivitySchema.index({ boardId: 1, createdAt: -1, _id: -1 });
+ActivitySchema.index({ userId: 1, createdAt: -1, _id: -1 });
+// Range scans for the retention job. Always declared without options so the
+// spec never changes; ACTIVITY_TTL_DAYS is applied to it with collMod.
+ActivitySchema.index({ createdAt: 1 });
+
 export const Activity =
   mongoose.models.Activity ||
   mongoose.model<IActivity>('Activity', ActivitySchema);
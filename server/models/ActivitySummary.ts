@@ -0,0 +1,49 @@
+import mongoose, { Schema, Document, Types } from "mongoose";
+
+export interface IActivityUserCount {
+  userId: Types.ObjectId;
+  userName?: string;
+  count: number;
+}
+
+// One board's activities for one UTC day, written by the retention job once
+// the raw rows fall outside the retention window
+export interface IActivitySummary extends Document {
+  boardId: Types.ObjectId;
+  day: Date;
+  total: number;
+  byAction: Map<string, number>;
+  byUser: IActivityUserCount[];
+  // Rollup batches already folded in, so a re-run after a crash cannot double count
+  appliedBatches: string[];
+  createdAt: Date;
+  updatedAt: Date;
+}
+
+const ActivitySummarySchema = new Schema<IActivitySummary>(
+  {
+    boardId: { type: Schema.Types.ObjectId, ref: "Board", required: true },
+    day: { type: Date, required: true },
+    total: { type: Number, default: 0 },
+    byAction: { type: Map, of: Number, default: {} },
+    byUser: {
+      type: [
+        {
+          _id: false,
+          userId: { type: Schema.Types.ObjectId, ref: "User" },
+          userName: { type: String },
+          count: { type: Number, default: 0 },
+        },
+      ],
+      default: [],
+    },
+    appliedBatches: { type: [String], default: [] },
+  },
+  { timestamps: true },
+);
+
+ActivitySummarySchema.index({ boardId: 1, day: -1 }, { unique: true });
+
+export const ActivitySummary =
+  mongoose.models.ActivitySummary ||
+  mongoose.model<IActivitySummary>("ActivitySummary", ActivitySummarySchema);
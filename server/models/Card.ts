@@ -19,6 +19,7 @@ export interface ICard extends Document {
   tags: string[];
   order: number;
   history: IHistoryEntry[];
+  version: number;
   createdAt: Date;
   updatedAt: Date;
 }
@@ -47,9 +48,16 @@ const CardSchema = new Schema<ICard>(
     tags: { type: [String], default: [] },
     order: { type: Number, default: 0 },
     history: { type: [HistorySchema], default: [] },
+    // Bumped on every update; clients use it to detect missed card:patch events
+    version: { type: Number, default: 0 },
   },
   { timestamps: true },
 );
 
+// Board listing by order, and keyset pages within a column; _id breaks ties
+// between cards with the same order so pages never skip or repeat one
+CardSchema.index({ boardId: 1, order: 1 });
+CardSchema.index({ boardId: 1, columnId: 1, order: 1, _id: 1 });
+
 export const Card =
   mongoose.models.Card || mongoose.model<ICard>("Card", CardSchema);
@@ -1,6 +1,8 @@
 import path from "path";
 import { createServer } from "./index";
 import express from "express";
+import { startActivityRetention } from "./activityRetention";
+import { drainActivities } from "./activityQueue";
 
 const port = process.env.BACKEND_PORT || process.env.PORT || 8002;
 
@@ -29,6 +31,8 @@ async function startServer() {
     console.log(`📱 Frontend: http://localhost:${port}`);
     console.log(`🔧 API: http://localhost:${port}/api`);
   });
+
+  startActivityRetention();
 }
 
 startServer().catch((err) => {
@@ -36,13 +40,16 @@ startServer().catch((err) => {
   process.exit(1);
 });
 
-// Graceful shutdown
-process.on("SIGTERM", () => {
-  console.log("🛑 Received SIGTERM, shutting down gracefully");
+// Graceful shutdown: write buffered activities before exiting
+let shuttingDown = false;
+async function shutdown(signal: string) {
+  if (shuttingDown) return;
+  shuttingDown = true;
+  console.log(`🛑 Received ${signal}, shutting down gracefully`);
+  const lost = await drainActivities();
+  if (lost) console.error(`Exiting with ${lost} unwritten activities`);
   process.exit(0);
-});
+}
 
-process.on("SIGINT", () => {
-  console.log("🛑 Received SIGINT, shutting down gracefully");
-  process.exit(0);
-});
+process.on("SIGTERM", () => shutdown("SIGTERM"));
+process.on("SIGINT", () => shutdown("SIGINT"));
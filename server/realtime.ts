@@ -0,0 +1,117 @@
+import type { Server as IOServer } from "socket.io";
+
+// Room names shared by the socket handlers and the HTTP controllers
+export const boardRoom = (boardId: unknown) => `board:${boardId}`;
+export const userRoom = (userId: unknown) => `user:${userId}`;
+// Joined only by sockets that opted into the activity feed of a board they belong to.
+// Like every room these are local to one Node process, and a feed socket is
+// pinned to one board's worker, so the feed misses boards served by other
+// workers unless the proxy runs a single worker (NODE_WORKERS=1).
+export const activityRoom = (boardId: unknown) => `activity:${boardId}`;
+
+export function emitToBoard(io: IOServer | undefined, boardId: unknown, event: string, payload: unknown) {
+  if (!io || !boardId) return;
+  io.to(boardRoom(boardId)).emit(event, payload);
+}
+
+// Deliver an activity to its board room plus feed subscribers of that board.
+// Board-less activities only reach the acting user's own feed.
+export function emitActivity(io: IOServer | undefined, activity: any) {
+  if (!io || !activity) return;
+  const rooms: string[] = [];
+  if (activity.boardId) rooms.push(boardRoom(activity.boardId), activityRoom(activity.boardId));
+  if (activity.userId) rooms.push(userRoom(activity.userId._id || activity.userId));
+  if (rooms.length) io.to(rooms).emit("activity:new", activity);
+}
+
+// Add a board to the feed of a user who is already subscribed
+export function subscribeUserToBoard(io: IOServer | undefined, userId: unknown, boardId: unknown) {
+  if (!io || !userId || !boardId) return;
+  io.in(userRoom(userId)).socketsJoin(activityRoom(boardId));
+}
+
+// Card patches are coalesced per card and flushed as one `cards:batch` frame
+// per board room. 0 disables batching and emits `card:patch` directly.
+const CARD_BATCH_WINDOW_MS = Number(process.env.CARD_BATCH_WINDOW_MS ?? 50);
+
+export interface CardPatch {
+  _id: unknown;
+  boardId: unknown;
+  // Version the changes apply on top of, and the version they produce
+  baseVersion: number;
+  version: number;
+  changes: Record<string, unknown>;
+}
+
+interface PendingBatch {
+  io: IOServer;
+  // Per card, runs of contiguous versions ordered by baseVersion
+  patches: Map<string, CardPatch[]>;
+  timer: ReturnType<typeof setTimeout>;
+}
+
+const pendingBatches = new Map<string, PendingBatch>();
+
+// Fold a patch into a card's queued runs. Concurrent updates can be queued
+// out of order, so only contiguous versions (one's version is the other's
+// baseVersion) merge; a missing version in between keeps the runs apart, so
+// a client that lacks it sees the gap and resyncs instead of applying stale
+// fields over newer state.
+function addPatch(runs: CardPatch[], patch: CardPatch): CardPatch[] {
+  const sorted = [...runs, patch].sort((a, b) => a.baseVersion - b.baseVersion);
+  const merged: CardPatch[] = [];
+  for (const next of sorted) {
+    const last = merged[merged.length - 1];
+    if (last && last.version === next.baseVersion) {
+      merged[merged.length - 1] = {
+        ...next,
+        baseVersion: last.baseVersion,
+        changes: { ...last.changes, ...next.changes },
+      };
+    } else {
+      merged.push(next);
+    }
+  }
+  return merged;
+}
+
+function flushCardBatch(boardId: string) {
+  const batch = pendingBatches.get(boardId);
+  if (!batch) return;
+  pendingBatches.delete(boardId);
+  batch.io.to(boardRoom(boardId)).emit("cards:batch", {
+    boardId,
+    patches: [...batch.patches.values()].flat(),
+  });
+}
+
+export function queueCardPatch(io: IOServer | undefined, boardId: unknown, patch: CardPatch) {
+  if (!io || !boardId) return;
+  if (CARD_BATCH_WINDOW_MS <= 0) {
+    emitToBoard(io, boardId, "card:patch", patch);
+    return;
+  }
+  const key = String(boardId);
+  let batch = pendingBatches.get(key);
+  if (!batch) {
+    batch = {
+      io,
+      patches: new Map(),
+      timer: setTimeout(() => flushCardBatch(key), CARD_BATCH_WINDOW_MS),
+    };
+    pendingBatches.set(key, batch);
+  }
+  const cardId = String(patch._id);
+  batch.patches.set(cardId, addPatch(batch.patches.get(cardId) || [], patch));
+}
+
+// Forget a queued patch so it cannot arrive after the card's delete
+export function dropCardPatch(boardId: unknown, cardId: unknown) {
+  const batch = pendingBatches.get(String(boardId));
+  if (!batch) return;
+  batch.patches.delete(String(cardId));
+  if (batch.patches.size === 0) {
+    clearTimeout(batch.timer);
+    pendingBatches.delete(String(boardId));
+  }
+}
@@ -3,15 +3,18 @@ import {
   createBoard,
   listBoards,
   getBoard,
+  getBoardSnapshot,
   inviteMember,
 } from "../controllers/boardsController";
 import { authMiddleware } from "../middleware/authMiddleware";
+import { requireRole } from "../middleware/roleMiddleware";
 
 const router = express.Router();
 
 router.post("/", authMiddleware, createBoard);
 router.get("/", authMiddleware, listBoards);
 router.get("/:id", authMiddleware, getBoard);
-router.post("/:id/invite", authMiddleware, inviteMember);
+router.get("/:id/snapshot", authMiddleware, requireRole("viewer"), getBoardSnapshot);
+router.post("/:id/invite", authMiddleware, requireRole("editor"), inviteMember);
 
 export default router;
@@ -4,69 +4,1231 @@ FastAPI wrapper that proxies all requests to the Node.js backend.
 This allows supervisor's uvicorn command to work while using our Node.js server.
 """
 import os
+import re
+import json
+import hashlib
 import subprocess
 import signal
 import sys
-from fastapi import FastAPI, Request, Response
-from fastapi.responses import StreamingResponse
+import itertools
+import time
+import zlib
+import mimetypes
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 import httpx
 import asyncio
 
-# Start the Node.js server as a subprocess
+try:
+    from admission import AdmissionController, Overloaded
+except ImportError:  # imported as a package module (server.server)
+    from .admission import AdmissionController, Overloaded
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # gzip only
+
+try:
+    # websockets >= 14 ships the new asyncio client under this module
+    from websockets.asyncio.client import connect as ws_connect
+    WS_HEADERS_ARG = 'additional_headers'
+except ImportError:
+    from websockets import connect as ws_connect
+    WS_HEADERS_ARG = 'extra_headers'
+
+# Start the Node.js workers as subprocesses
 os.chdir('/app')
-os.environ['PORT'] = '8002'  # Node runs on 8002
 os.environ['MONGO_URL'] = 'mongodb://localhost:27017/flowspace'
 
-node_process = None
+# Node workers listen on consecutive ports starting at NODE_BASE_PORT.
+# Socket.io rooms are per process and there is no cross-process adapter:
+# board rooms work with more workers because sockets and mutations are
+# pinned by board, but the per-user activity feed (user:<id> and
+# activity:<boardId> rooms) only sees boards pinned to the same worker, and
+# card-id mutations without X-Board-Id can miss their board's worker. So a
+# single worker stays the default; raise it only where that is acceptable.
+NODE_WORKERS = int(os.environ.get('NODE_WORKERS') or 1)
+NODE_BASE_PORT = int(os.environ.get('NODE_BASE_PORT', '8002'))
+NODE_HEALTH_INTERVAL = float(os.environ.get('NODE_HEALTH_INTERVAL', '5'))
+NODE_HEALTH_TIMEOUT = float(os.environ.get('NODE_HEALTH_TIMEOUT', '2'))
+NODE_RESTART_BACKOFF_MAX = float(os.environ.get('NODE_RESTART_BACKOFF_MAX', '30'))
+# A worker that stays up this long gets its restart backoff reset
+NODE_STABLE_AFTER = float(os.environ.get('NODE_STABLE_AFTER', '60'))
+# Shared deadline for all workers to drain on SIGTERM before they are killed
+# (node-build.ts gives its activity queue up to 10s)
+NODE_STOP_TIMEOUT = float(os.environ.get('NODE_STOP_TIMEOUT', '12'))
+
+# Upstream connection pool (override via environment)
+PROXY_MAX_CONNECTIONS = int(os.environ.get('PROXY_MAX_CONNECTIONS', '100'))
+PROXY_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get('PROXY_MAX_KEEPALIVE_CONNECTIONS', '20'))
+PROXY_KEEPALIVE_EXPIRY = float(os.environ.get('PROXY_KEEPALIVE_EXPIRY', '30'))
+PROXY_POOL_TIMEOUT = float(os.environ.get('PROXY_POOL_TIMEOUT', '5'))
+PROXY_TIMEOUT = float(os.environ.get('PROXY_TIMEOUT', '30'))
+
+# Admission control: requests beyond the in-flight cap wait in a bounded
+# priority queue; anything that can't be queued is shed with a 503. The
+# caps of all workers together must fit in the upstream pool, otherwise
+# admitted requests just wait for a connection and the queue never fills;
+# by default the pool is split evenly between the workers.
+PROXY_MAX_IN_FLIGHT_PER_WORKER = int(
+    os.environ.get('PROXY_MAX_IN_FLIGHT_PER_WORKER') or max(1, PROXY_MAX_CONNECTIONS // NODE_WORKERS)
+)
+PROXY_MAX_QUEUE_PER_WORKER = int(os.environ.get('PROXY_MAX_QUEUE_PER_WORKER', '256'))
+PROXY_QUEUE_TIMEOUT = float(os.environ.get('PROXY_QUEUE_TIMEOUT', '5'))
+PROXY_RETRY_AFTER = int(os.environ.get('PROXY_RETRY_AFTER', '2'))
+
+# Upstream timeouts per normalized route, e.g. '{"/api/user/export": 120}'
+PROXY_ROUTE_TIMEOUTS = {
+    '/api/user/export': 120.0,
+    '/api/user/avatar': 60.0,
+    **json.loads(os.environ.get('PROXY_ROUTE_TIMEOUTS') or '{}'),
+}
+
+# Heavy requests that queue behind interactive traffic
+BULK_ROUTES = {'/api/user/export', '/api/user/avatar'}
+PRIORITY_READ, PRIORITY_WRITE, PRIORITY_BULK = 0, 1, 2
+
+# WebSocket passthrough: frames buffered per direction before reads pause
+PROXY_WS_MAX_QUEUE = int(os.environ.get('PROXY_WS_MAX_QUEUE', '32'))
+PROXY_WS_MAX_SIZE = int(os.environ.get('PROXY_WS_MAX_SIZE', str(1024 * 1024)))
+
+# Files served straight from disk instead of through Node's express.static
+SPA_DIST_DIR = os.path.realpath(os.environ.get('SPA_DIST_DIR', '/app/dist/spa'))
+UPLOADS_DIR = os.path.realpath(os.environ.get('UPLOADS_DIR', '/app/uploads'))
+UPLOADS_MAX_AGE = int(os.environ.get('UPLOADS_MAX_AGE', '86400'))
+
+# Vite emits content-hashed bundles (assets/index-B1x2Yz9a.js) that never change
+HASHED_ASSET = re.compile(r'^/assets/.+-[A-Za-z0-9_-]{8,}\.[a-z0-9]+$')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Paths that always belong to Node (mirrors node-build.ts's SPA fallback)
+NODE_ONLY_PREFIXES = ('/api/', '/health', '/socket.io/')
+
+# Response cache for read-heavy GET endpoints
+PROXY_CACHE_MAX_BYTES = int(os.environ.get('PROXY_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+PROXY_CACHE_MAX_ENTRY_BYTES = int(os.environ.get('PROXY_CACHE_MAX_ENTRY_BYTES', str(2 * 1024 * 1024)))
+PROXY_CACHE_TTL = float(os.environ.get('PROXY_CACHE_TTL', '30'))
+
+OBJECT_ID = r'([0-9a-fA-F]{24})'
+
+# Cacheable routes; the capture group (if any) is the board the data belongs to
+CACHEABLE_ROUTES = [
+    re.compile(r'^/api/boards/?$'),
+    re.compile(rf'^/api/cards/{OBJECT_ID}/cards/?$'),
+    # /api/boards/:id is not cached: it carries the board's note, which is
+    # written over Socket.io (WebSocket or long-polling) where the proxy
+    # cannot tell when Node has applied the write
+    # /api/activity is not cached: activities are written by a background
+    # queue after the mutation's response, so invalidation would run too early
+]
+
+# Paths of mutating requests that name their board
+BOARD_MUTATION_ROUTES = [
+    re.compile(rf'^/api/boards/{OBJECT_ID}(?:/.*)?$'),
+    re.compile(rf'^/api/cards/{OBJECT_ID}/cards/?$'),
+    re.compile(rf'^/api/{OBJECT_ID}/notes/?$'),
+]
+
+# Card routes keyed by card id; Node names their board in an X-Board-Id
+# response header
+CARD_ID_ROUTE = re.compile(rf'^/api/cards/{OBJECT_ID}/?$')
+
+# Mutating requests that never change cached data: Socket.io long-polling
+# POSTs and login/refresh calls
+NON_INVALIDATING_PREFIXES = ('/socket.io/', '/api/auth/')
+
+# Response compression
+PROXY_COMPRESS_MIN_BYTES = int(os.environ.get('PROXY_COMPRESS_MIN_BYTES', '1024'))
+PROXY_GZIP_LEVEL = int(os.environ.get('PROXY_GZIP_LEVEL', '6'))
+PROXY_BROTLI_QUALITY = int(os.environ.get('PROXY_BROTLI_QUALITY', '4'))
+
+# Only text-like bodies are worth compressing; images (avatars under
+# /uploads), archives and binary downloads are already compressed.
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'application/manifest+json',
+    'image/svg+xml',
+)
+
+MUTATING_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+
+# Conditional headers are answered by the cache, not by Node
+CONDITIONAL_HEADERS = {'if-none-match', 'if-modified-since'}
+
+# Client headers worth passing on the upstream WebSocket handshake
+WS_FORWARD_HEADERS = ('cookie', 'authorization', 'user-agent', 'origin', 'x-forwarded-for')
+
+# Headers that only apply to a single hop and must not be forwarded
+HOP_BY_HOP_HEADERS = {
+    'connection',
+    'keep-alive',
+    'proxy-authenticate',
+    'proxy-authorization',
+    'te',
+    'trailers',
+    'transfer-encoding',
+    'upgrade',
+}
+
+# Internal endpoints answered by this process instead of Node
+INTERNAL_PREFIX = '/_proxy/'
+LOCAL_PATHS = {'/metrics'}
+# /_proxy/* exposes PIDs and per-connection counters, so it only answers
+# peers on these addresses (X-Forwarded-For is not trusted)
+PROXY_INTERNAL_HOSTS = set(
+    host.strip() for host in os.environ.get('PROXY_INTERNAL_HOSTS', '127.0.0.1,::1').split(',') if host.strip()
+)
+
+# Latency histogram buckets (seconds)
+METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Hard cap on distinct route labels, whatever the normalizer lets through
+METRICS_MAX_ROUTES = int(os.environ.get('METRICS_MAX_ROUTES', '200'))
+
+pool_stats = {
+    'requests_total': 0,
+    'in_flight': 0,
+    'peak_in_flight': 0,
+    'pool_timeouts': 0,
+    'upstream_errors': 0,
+    'shed': 0,
+    'queue_timeouts': 0,
+}
+
+ws_stats = {
+    'connections_total': 0,
+    'connections_open': 0,
+    'upstream_errors': 0,
+    'client_to_node_messages': 0,
+    'client_to_node_bytes': 0,
+    'node_to_client_messages': 0,
+    'node_to_client_bytes': 0,
+}
+ws_connections = {}
+ws_connection_ids = itertools.count(1)
+
+class NodeWorker:
+    """One supervised `node dist/server/node-build.mjs` process"""
+
+    def __init__(self, index, port):
+        self.index = index
+        self.port = port
+        self.url = f"http://localhost:{port}"
+        self.ws_url = f"ws://localhost:{port}"
+        self.process = None
+        self.healthy = False
+        self.active = 0
+        self.restarts = 0
+        self.backoff = 1.0
+        self.started_at = 0.0
+        self.restart_at = None
+        self.admission = AdmissionController(PROXY_MAX_IN_FLIGHT_PER_WORKER, PROXY_MAX_QUEUE_PER_WORKER)
+
+    def start(self):
+        env = {
+            **os.environ,
+            'PORT': str(self.port),
+            'BACKEND_PORT': str(self.port),
+            # Lets Node run singleton background jobs on worker 0 only
+            'NODE_WORKER_INDEX': str(self.index),
+            'NODE_WORKERS': str(NODE_WORKERS),
+        }
+        self.process = subprocess.Popen(
+            ['node', 'dist/server/node-build.mjs'],
+            stdout=sys.stdout,
+            stderr=sys.stderr,
+            cwd='/app',
+            env=env,
+        )
+        self.started_at = time.time()
+        self.restart_at = None
+        print(f"Started Node.js worker {self.index} on port {self.port} with PID: {self.process.pid}")
+
+    def terminate(self):
+        if self.is_running():
+            self.process.terminate()
+
+    def wait_stopped(self, deadline):
+        """Wait for a terminated worker to exit, killing it past `deadline`"""
+        if self.process is None:
+            return
+        try:
+            self.process.wait(timeout=max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            print(f"Node.js worker {self.index} did not exit in time, killing it")
+            self.process.kill()
+            self.process.wait()
+
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def describe(self):
+        return {
+            'index': self.index,
+            'port': self.port,
+            'pid': self.process.pid if self.process else None,
+            'running': self.is_running(),
+            'healthy': self.healthy,
+            'active': self.active,
+            'restarts': self.restarts,
+            'admission': self.admission.describe(),
+        }
+
+node_workers = [NodeWorker(i, NODE_BASE_PORT + i) for i in range(NODE_WORKERS)]
+
+class ResponseCache:
+    """Size-bounded LRU of upstream GET responses with strong ETags"""
+
+    def __init__(self, max_bytes, ttl):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.size = 0
+        # Bumped on every invalidation so a response fetched before a
+        # mutation is never stored after it.
+        self.generation = 0
+        self.stats = {'hits': 0, 'misses': 0, 'not_modified': 0, 'invalidations': 0, 'evictions': 0}
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None or time.time() - entry['stored_at'] > self.ttl:
+            if entry is not None:
+                self._drop(key)
+            self.stats['misses'] += 1
+            return None
+        self.entries.move_to_end(key)
+        self.stats['hits'] += 1
+        return entry
+
+    def put(self, key, board_id, status_code, headers, body):
+        entry = {
+            'key': key,
+            'board_id': board_id,
+            'status_code': status_code,
+            'headers': headers,
+            'body': body,
+            'etag': '"' + hashlib.sha256(body).hexdigest() + '"',
+            'stored_at': time.time(),
+            'variants': {},
+            'size': len(body),
+        }
+        if key in self.entries:
+            self._drop(key)
+        self.entries[key] = entry
+        self.size += len(body)
+        self._evict()
+        return entry
+
+    def variant(self, entry, encoding):
+        """Compressed copy of an entry's body, built once per encoding"""
+        # Variants count against max_bytes like the identity body does
+        body = entry['variants'].get(encoding)
+        if body is None:
+            body = compress_bytes(entry['body'], encoding)
+            entry['variants'][encoding] = body
+            entry['size'] += len(body)
+            if self.entries.get(entry['key']) is entry:
+                self.size += len(body)
+                self._evict()
+        return body
+
+    def invalidate(self, board_id=None):
+        """Drop one board's entries plus every cross-board listing, or everything"""
+        self.generation += 1
+        self.stats['invalidations'] += 1
+        for key in list(self.entries):
+            entry_board = self.entries[key]['board_id']
+            if board_id is None or entry_board is None or entry_board == board_id:
+                self._drop(key)
+
+    def _drop(self, key):
+        entry = self.entries.pop(key)
+        self.size -= entry['size']
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits its budget"""
+        while self.size > self.max_bytes and self.entries:
+            self._drop(next(iter(self.entries)))
+            self.stats['evictions'] += 1
+
+    def describe(self):
+        return {**self.stats, 'entries': len(self.entries), 'bytes': self.size, 'max_bytes': self.max_bytes}
+
+response_cache = ResponseCache(PROXY_CACHE_MAX_BYTES, PROXY_CACHE_TTL)
+
+class Histogram:
+    """Cumulative Prometheus-style histogram"""
+
+    def __init__(self):
+        self.counts = [0] * len(METRICS_BUCKETS)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(METRICS_BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += 1
+        self.sum += value
+
+class ProxyMetrics:
+    """Per-route latency histograms and counters for the /metrics endpoint"""
+
+    def __init__(self):
+        self.request_seconds = {}
+        self.upstream_seconds = {}
+        self.overhead_seconds = {}
+        self.responses = {}
+        self.upstream_errors = {}
+        self.in_flight = 0
+
+    def observe(self, labels, status_code, total, upstream, overhead):
+        self.request_seconds.setdefault(labels, Histogram()).observe(total)
+        if upstream is not None:
+            self.upstream_seconds.setdefault(labels, Histogram()).observe(upstream)
+        self.overhead_seconds.setdefault(labels, Histogram()).observe(overhead)
+        key = labels + (str(status_code),)
+        self.responses[key] = self.responses.get(key, 0) + 1
+
+    def upstream_error(self, labels, kind):
+        key = labels + (kind,)
+        self.upstream_errors[key] = self.upstream_errors.get(key, 0) + 1
+
+proxy_metrics = ProxyMetrics()
+known_routes = set()
+UNMATCHED_ROUTE = 'unmatched'
+
+def normalize_route(path):
+    """Collapse ids and tokens so route labels stay low-cardinality"""
+    if path.startswith('/socket.io/'):
+        return '/socket.io/'
+    if path.startswith('/uploads/'):
+        return '/uploads/*'
+    if not path.startswith('/api/'):
+        return '/*'  # SPA routes and bundle assets
+    segments = []
+    for segment in path.rstrip('/').split('/'):
+        if re.fullmatch(r'[0-9a-fA-F]{24}', segment):
+            segment = ':id'
+        elif re.fullmatch(r'[0-9a-fA-F]{32,}', segment) or segment.startswith('demo-'):
+            segment = ':token'
+        elif any(ch.isdigit() for ch in segment):
+            segment = ':id'
+        segments.append(segment)
+    return '/'.join(segments)
+
+def route_label(route, status_code=None):
+    """Metrics label for a normalized route, within the METRICS_MAX_ROUTES budget"""
+    # Only API routes Node actually served take a slot: scanner and other
+    # 404 traffic (or a failure before any answer) gets one fixed label, so
+    # it can't use up the budget and push real routes into 'other'.
+    if not route.startswith('/api/') or route in known_routes:
+        return route
+    if status_code is None or status_code == 404:
+        return UNMATCHED_ROUTE
+    if len(known_routes) >= METRICS_MAX_ROUTES:
+        return 'other'
+    known_routes.add(route)
+    return route
+
+class RequestTimer:
+    """Splits one request's latency into upstream (Node) and proxy time"""
+
+    def __init__(self, request: Request):
+        self.route = normalize_route(request.url.path)
+        self.method = request.method
+        self.started = time.perf_counter()
+        self.upstream_started = None
+        self.upstream = None
+        self.overhead = None
+        self.finished = False
+        proxy_metrics.in_flight += 1
+
+    def begin_upstream(self):
+        self.upstream_started = time.perf_counter()
+
+    def end_upstream(self):
+        # Node answers once its handler (and its Mongo work) is done
+        self.upstream = time.perf_counter() - self.upstream_started
+
+    def respond(self):
+        """Mark the point where the proxy hands its response to the server"""
+        if self.overhead is None:
+            elapsed = time.perf_counter() - self.started
+            self.overhead = max(elapsed - (self.upstream or 0.0), 0.0)
+
+    def upstream_error(self, kind):
+        proxy_metrics.upstream_error((route_label(self.route), self.method), kind)
+
+    def finish(self, status_code):
+        """Record the request once its last body byte has gone out"""
+        if self.finished:
+            return
+        self.finished = True
+        self.respond()
+        proxy_metrics.in_flight -= 1
+        total = time.perf_counter() - self.started
+        labels = (route_label(self.route, status_code), self.method)
+        proxy_metrics.observe(labels, status_code, total, self.upstream, self.overhead)
+
+def escape_label_value(value):
+    """Escape a label value as the text exposition format requires"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def prometheus_labels(names, values):
+    pairs = ','.join(f'{name}="{escape_label_value(value)}"' for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+def render_histograms(lines, name, help_text, histograms):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} histogram')
+    for (route, method), histogram in sorted(histograms.items()):
+        for bound, count in zip(METRICS_BUCKETS, histogram.counts):
+            labels = prometheus_labels(('route', 'method', 'le'), (route, method, bound))
+            lines.append(f'{name}_bucket{labels} {count}')
+        labels = prometheus_labels(('route', 'method', 'le'), (route, method, '+Inf'))
+        lines.append(f'{name}_bucket{labels} {histogram.total}')
+        labels = prometheus_labels(('route', 'method'), (route, method))
+        lines.append(f'{name}_sum{labels} {histogram.sum}')
+        lines.append(f'{name}_count{labels} {histogram.total}')
+
+def render_metrics():
+    """Prometheus text exposition of everything the proxy tracks"""
+    lines = []
+    render_histograms(lines, 'flowspace_proxy_request_duration_seconds',
+                      'Time from request arrival to the last response byte.',
+                      proxy_metrics.request_seconds)
+    render_histograms(lines, 'flowspace_proxy_upstream_duration_seconds',
+                      'Time until the Node worker returned response headers.',
+                      proxy_metrics.upstream_seconds)
+    render_histograms(lines, 'flowspace_proxy_overhead_duration_seconds',
+                      'Time spent in the proxy before the response started, excluding Node.',
+                      proxy_metrics.overhead_seconds)
+
+    lines.append('# HELP flowspace_proxy_responses_total Responses by route, method and status.')
+    lines.append('# TYPE flowspace_proxy_responses_total counter')
+    for key, count in sorted(proxy_metrics.responses.items()):
+        labels = prometheus_labels(('route', 'method', 'status'), key)
+        lines.append(f'flowspace_proxy_responses_total{labels} {count}')
+
+    lines.append('# HELP flowspace_proxy_upstream_errors_total Failed upstream requests by kind.')
+    lines.append('# TYPE flowspace_proxy_upstream_errors_total counter')
+    for key, count in sorted(proxy_metrics.upstream_errors.items()):
+        labels = prometheus_labels(('route', 'method', 'kind'), key)
+        lines.append(f'flowspace_proxy_upstream_errors_total{labels} {count}')
+
+    lines.append('# HELP flowspace_proxy_in_flight Requests currently being proxied.')
+    lines.append('# TYPE flowspace_proxy_in_flight gauge')
+    lines.append(f'flowspace_proxy_in_flight {proxy_metrics.in_flight}')
+
+    lines.append('# HELP flowspace_node_worker_in_flight Requests in flight per Node worker.')
+    lines.append('# TYPE flowspace_node_worker_in_flight gauge')
+    for worker in node_workers:
+        labels = prometheus_labels(('worker',), (worker.index,))
+        lines.append(f'flowspace_node_worker_in_flight{labels} {worker.active}')
+
+    lines.append('# HELP flowspace_node_worker_healthy Whether the Node worker passed its last health check (1) or not (0).')
+    lines.append('# TYPE flowspace_node_worker_healthy gauge')
+    for worker in node_workers:
+        labels = prometheus_labels(('worker',), (worker.index,))
+        lines.append(f'flowspace_node_worker_healthy{labels} {int(worker.healthy)}')
+
+    lines.append('# HELP flowspace_node_worker_queued Requests waiting for admission per Node worker.')
+    lines.append('# TYPE flowspace_node_worker_queued gauge')
+    for worker in node_workers:
+        labels = prometheus_labels(('worker',), (worker.index,))
+        lines.append(f'flowspace_node_worker_queued{labels} {len(worker.admission.waiters)}')
+
+    lines.append('# HELP flowspace_proxy_cache_events_total Response cache events by kind.')
+    lines.append('# TYPE flowspace_proxy_cache_events_total counter')
+    for event in ('hits', 'misses', 'not_modified', 'invalidations', 'evictions'):
+        labels = prometheus_labels(('event',), (event,))
+        lines.append(f'flowspace_proxy_cache_events_total{labels} {response_cache.stats[event]}')
+
+    lines.append('# HELP flowspace_proxy_websockets_open WebSocket connections currently relayed to Node.')
+    lines.append('# TYPE flowspace_proxy_websockets_open gauge')
+    lines.append(f"flowspace_proxy_websockets_open {ws_stats['connections_open']}")
+    return '\n'.join(lines) + '\n'
 
 def start_node_server():
-    global node_process
-    node_process = subprocess.Popen(
-        ['node', 'dist/server/node-build.mjs'],
-        stdout=sys.stdout,
-        stderr=sys.stderr,
-        cwd='/app'
-    )
-    print(f"Started Node.js server with PID: {node_process.pid}")
+    for worker in node_workers:
+        worker.start()
+
+def stop_node_workers():
+    # Signal every worker first so they all drain at once under one deadline
+    for worker in node_workers:
+        worker.terminate()
+    deadline = time.monotonic() + NODE_STOP_TIMEOUT
+    for worker in node_workers:
+        worker.wait_stopped(deadline)
+
+async def stop_node_workers_async():
+    for worker in node_workers:
+        worker.terminate()
+    deadline = time.monotonic() + NODE_STOP_TIMEOUT
+    await asyncio.gather(*(asyncio.to_thread(worker.wait_stopped, deadline) for worker in node_workers))
 
 def cleanup(signum, frame):
-    global node_process
-    if node_process:
-        node_process.terminate()
-        node_process.wait()
+    stop_node_workers()
     sys.exit(0)
 
 signal.signal(signal.SIGTERM, cleanup)
 signal.signal(signal.SIGINT, cleanup)
 
-# Start Node.js server
+# Start Node.js workers
 start_node_server()
 
+async def check_worker(client, worker: NodeWorker):
+    """Restart a crashed worker (with backoff) or refresh its health flag"""
+    now = time.time()
+    if not worker.is_running():
+        worker.healthy = False
+        if worker.restart_at is None:
+            code = worker.process.returncode if worker.process else None
+            worker.restart_at = now + worker.backoff
+            print(f"Node.js worker {worker.index} exited ({code}), restarting in {worker.backoff:.0f}s")
+            worker.backoff = min(worker.backoff * 2, NODE_RESTART_BACKOFF_MAX)
+        elif now >= worker.restart_at:
+            worker.restarts += 1
+            worker.start()
+        return
+
+    try:
+        response = await client.get(f"{worker.url}/api/ping", timeout=NODE_HEALTH_TIMEOUT)
+        worker.healthy = response.status_code == 200
+    except httpx.HTTPError:
+        worker.healthy = False
+    if worker.healthy and now - worker.started_at >= NODE_STABLE_AFTER:
+        worker.backoff = 1.0
+
+async def supervise_node_workers(client):
+    while True:
+        for worker in node_workers:
+            await check_worker(client, worker)
+        await asyncio.sleep(NODE_HEALTH_INTERVAL)
+
+def least_connections_worker():
+    """Pick the healthy worker with the fewest in-flight requests"""
+    candidates = [w for w in node_workers if w.healthy] or \
+        [w for w in node_workers if w.is_running()] or node_workers
+    return min(candidates, key=lambda w: w.active)
+
+def pinned_worker(key):
+    """Map a board id (or other affinity key) to a stable worker"""
+    # Rendezvous hashing over the healthy workers: a key only moves when its
+    # own worker goes down, and then every request for it moves to the same
+    # fallback, so a board's sockets and mutations still share one process.
+    candidates = [w for w in node_workers if w.healthy] or node_workers
+    return max(candidates, key=lambda w: zlib.crc32(f"{w.index}:{key}".encode()))
+
+def socket_pin_key(websocket_or_request):
+    """Socket.io traffic sticks to one worker per board room"""
+    # Rooms live in a single Node process, so every socket of a board (and
+    # every polling request of a session) must land on the same worker.
+    board_id = websocket_or_request.query_params.get('boardId')
+    if board_id:
+        return board_id
+    client = websocket_or_request.client
+    return client.host if client else ''
+
+def path_board_id(path):
+    """Board named by a mutating request's path, if any"""
+    for pattern in BOARD_MUTATION_ROUTES:
+        match = pattern.match(path)
+        if match:
+            return match.group(1)
+    return None
+
+def route_worker(request: Request):
+    if request.url.path.startswith('/socket.io/'):
+        return pinned_worker(socket_pin_key(request))
+    # Mutations broadcast to their board room, so run them on that room's
+    # worker. The path is authoritative; X-Board-Id (the board open in the
+    # UI) covers routes keyed by card id.
+    if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+        board_id = path_board_id(request.url.path) or request.headers.get('x-board-id')
+        if board_id:
+            return pinned_worker(board_id)
+    return least_connections_worker()
+
+def create_upstream_client():
+    """Build the shared keep-alive client used for every proxied request"""
+    # httpx never pipelines HTTP/1.1 requests: each pooled connection carries
+    # one request at a time, so max_connections bounds upstream concurrency.
+    limits = httpx.Limits(
+        max_connections=PROXY_MAX_CONNECTIONS,
+        max_keepalive_connections=PROXY_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=PROXY_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(PROXY_TIMEOUT, pool=PROXY_POOL_TIMEOUT)
+    return httpx.AsyncClient(
+        limits=limits,
+        timeout=timeout,
+        http1=True,
+        http2=False,
+    )
+
+def pool_connection_counts(client):
+    """Count open/idle upstream connections held by the client's pool"""
+    pool = getattr(getattr(client, '_transport', None), '_pool', None)
+    connections = list(getattr(pool, 'connections', None) or [])
+    idle = sum(1 for conn in connections if conn.is_idle())
+    return {
+        'open': len(connections),
+        'idle': idle,
+        'active': len(connections) - idle,
+    }
+
+def filter_headers(headers):
+    """Drop hop-by-hop headers before passing them to the next hop"""
+    return {
+        key.lower(): value
+        for key, value in headers.items()
+        if key.lower() not in HOP_BY_HOP_HEADERS
+    }
+
+def cacheable_route(path):
+    """Return (cacheable, board_id) for a GET path"""
+    for pattern in CACHEABLE_ROUTES:
+        match = pattern.match(path)
+        if match:
+            return True, match.group(1) if pattern.groups else None
+    return False, None
+
+def response_cache_key(request: Request):
+    # Keyed on the bearer credential rather than a decoded user id: the proxy
+    # does not verify tokens, and a forged token must never map to another
+    # user's entries.
+    auth = request.headers.get('authorization')
+    if not auth:
+        return None
+    identity = hashlib.sha256(auth.encode()).hexdigest()
+    return (request.url.path, request.url.query, identity)
+
+def mutation_board_id(request: Request, response=None):
+    """Board touched by a mutating request, or None if it can't be told"""
+    # The client's X-Board-Id is only the board open in the UI, so card-id
+    # routes take their board from Node's response instead. Routes such as
+    # profile edits or invite acceptance change other boards too, and a
+    # failed upstream call has no response: None clears everything.
+    board_id = path_board_id(request.url.path)
+    if board_id:
+        return board_id
+    if response is not None and CARD_ID_ROUTE.match(request.url.path):
+        return response.headers.get('x-board-id')
+    return None
+
+def invalidate_for_mutation(request: Request, response=None):
+    """Drop cached reads a mutating request may have changed"""
+    if request.url.path.startswith(NON_INVALIDATING_PREFIXES):
+        return
+    response_cache.invalidate(mutation_board_id(request, response))
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    return '*' in candidates or etag in [tag.removeprefix('W/') for tag in candidates]
+
+def accepts_encoding(request: Request, encoding):
+    """Whether Accept-Encoding allows `encoding`, honouring q=0"""
+    accepted = {}
+    for part in request.headers.get('accept-encoding', '').split(','):
+        name, _, params = part.partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name.strip():
+            accepted[name.strip().lower()] = quality
+    return accepted.get(encoding, accepted.get('*', 0)) > 0
+
+def negotiate_encoding(request: Request):
+    """Pick br or gzip for on-the-fly compression"""
+    if brotli is not None and accepts_encoding(request, 'br'):
+        return 'br'
+    if accepts_encoding(request, 'gzip'):
+        return 'gzip'
+    return None
+
+def should_compress(request: Request, status_code, headers):
+    """Whether a response is worth compressing for this client"""
+    if request.method == 'HEAD' or status_code in (204, 206, 304) or status_code < 200:
+        return False
+    if request.url.path.startswith('/socket.io/') or 'content-encoding' in headers:
+        return False
+    content_type = headers.get('content-type', '').lower()
+    if not content_type.startswith(COMPRESSIBLE_TYPES):
+        return False
+    # Unknown length means a chunked body, which is compressed as it streams
+    content_length = int(headers.get('content-length') or -1)
+    return content_length < 0 or content_length >= PROXY_COMPRESS_MIN_BYTES
+
+def new_compressor(encoding):
+    """Return (compress, finish) callables for a streaming encoder"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=PROXY_BROTLI_QUALITY)
+        return compressor.process, compressor.finish
+    compressor = zlib.compressobj(PROXY_GZIP_LEVEL, zlib.DEFLATED, 31)  # 31 = gzip framing
+    return compressor.compress, compressor.flush
+
+def compress_bytes(body, encoding):
+    compress, finish = new_compressor(encoding)
+    return compress(body) + finish()
+
+async def compress_stream(chunks, encoding):
+    compress, finish = new_compressor(encoding)
+    try:
+        async for chunk in chunks:
+            data = compress(chunk)
+            if data:
+                yield data
+        yield finish()
+    finally:
+        await chunks.aclose()  # release the upstream right away on disconnect
+
+def encoded_headers(headers, encoding):
+    headers = {**headers, 'content-encoding': encoding}
+    headers.pop('content-length', None)
+    vary = headers.get('vary')
+    headers['vary'] = f"{vary}, Accept-Encoding" if vary else 'Accept-Encoding'
+    return headers
+
+def cached_response(entry, request: Request):
+    headers = {
+        **entry['headers'],
+        'cache-control': 'private, no-cache',
+        'vary': 'Authorization',
+    }
+    body = entry['body']
+    etag = entry['etag']
+    encoding = negotiate_encoding(request)
+    if encoding and should_compress(request, entry['status_code'], headers):
+        body = response_cache.variant(entry, encoding)
+        headers = encoded_headers(headers, encoding)
+        # Each representation needs its own strong validator
+        etag = f'{etag[:-1]}-{encoding}"'
+    headers['etag'] = etag
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        response_cache.stats['not_modified'] += 1
+        headers.pop('content-length', None)
+        headers.pop('content-type', None)
+        headers.pop('content-encoding', None)
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, status_code=entry['status_code'], headers=headers)
+
+def resolve_under(root, relative):
+    """Absolute path of `relative` inside `root`, or None if it escapes or is missing"""
+    path = os.path.realpath(os.path.join(root, relative.lstrip('/')))
+    if os.path.commonpath([root, path]) != root or not os.path.isfile(path):
+        return None
+    return path
+
+def static_file_for(path):
+    """(file, cache-control) for a path served from disk, or None to proxy it"""
+    if path.startswith('/uploads/'):
+        # Upload names are unique per upload, so they can be cached for a while
+        file_path = resolve_under(UPLOADS_DIR, path[len('/uploads/'):])
+        return (file_path, f'public, max-age={UPLOADS_MAX_AGE}') if file_path else None
+    if path.startswith(NODE_ONLY_PREFIXES) or not os.path.isdir(SPA_DIST_DIR):
+        return None
+    file_path = resolve_under(SPA_DIST_DIR, path)
+    if file_path:
+        if HASHED_ASSET.match(path):
+            return file_path, IMMUTABLE_CACHE_CONTROL
+        return file_path, 'public, max-age=0, must-revalidate'
+    # Client-side routes fall back to index.html, which must always revalidate
+    index = resolve_under(SPA_DIST_DIR, 'index.html')
+    return (index, 'no-cache') if index else None
+
+def precompressed_variant(request: Request, file_path):
+    """Pick a .br/.gz sibling built at deploy time, if the client accepts it"""
+    for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if accepts_encoding(request, encoding) and os.path.isfile(file_path + suffix):
+            return file_path + suffix, encoding
+    return None, None
+
+def static_response(request: Request):
+    """Serve /uploads and the built SPA from disk, or None to proxy to Node"""
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    found = static_file_for(request.url.path)
+    if not found:
+        return None
+    file_path, cache_control = found
+    media_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+    headers = {'cache-control': cache_control, 'vary': 'Accept-Encoding'}
+    served_path, encoding = precompressed_variant(request, file_path)
+    if served_path:
+        headers['content-encoding'] = encoding
+    else:
+        served_path = file_path
+    stat = os.stat(served_path)
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}{"-" + encoding if encoding else ""}"'
+    headers['etag'] = etag
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers=headers)
+    # FileResponse streams from disk (or hands the path to the server via the
+    # ASGI pathsend extension where supported) and answers Range requests.
+    return FileResponse(served_path, media_type=media_type, headers=headers, stat_result=stat)
+
+def internal_client(request: Request):
+    """Whether the direct peer may read the /_proxy/* stats"""
+    return request.client is not None and request.client.host in PROXY_INTERNAL_HOSTS
+
+def has_request_body(request: Request):
+    """Only requests that declare a body get one forwarded"""
+    return 'content-length' in request.headers or 'transfer-encoding' in request.headers
+
+def request_priority(request: Request, route):
+    if route in BULK_ROUTES:
+        return PRIORITY_BULK
+    if request.method in ('GET', 'HEAD'):
+        return PRIORITY_READ
+    return PRIORITY_WRITE
+
+def overloaded_response(reason):
+    return Response(
+        content=f"Proxy overloaded: {reason}",
+        status_code=503,
+        headers={'retry-after': str(PROXY_RETRY_AFTER)},
+    )
+
+class UpstreamSlot:
+    """One request's share of the in-flight counters, released exactly once"""
+
+    def __init__(self, worker: NodeWorker):
+        self.worker = worker
+        self.admitted = False  # holds an admission slot once acquire succeeds
+        self.released = False
+        pool_stats['requests_total'] += 1
+        pool_stats['in_flight'] += 1
+        pool_stats['peak_in_flight'] = max(pool_stats['peak_in_flight'], pool_stats['in_flight'])
+        worker.active += 1
+
+    def release(self):
+        if self.released:
+            return
+        self.released = True
+        pool_stats['in_flight'] -= 1
+        self.worker.active -= 1
+        if self.admitted:
+            self.worker.admission.release()
+
+async def release_upstream(response: httpx.Response, slot: UpstreamSlot, timer: RequestTimer):
+    await response.aclose()
+    slot.release()
+    timer.finish(response.status_code)
+
+class UpstreamRelease:
+    """Releases an upstream response and its admission slot exactly once"""
+
+    def __init__(self, response: httpx.Response, slot: UpstreamSlot, timer: RequestTimer):
+        self.response = response
+        self.slot = slot
+        self.timer = timer
+        self.released = False
+
+    async def __call__(self):
+        if self.released:
+            return
+        self.released = True
+        await release_upstream(self.response, self.slot, self.timer)
+
+async def relay_body(response: httpx.Response, release: UpstreamRelease):
+    """Relay the raw (still encoded) upstream body chunk by chunk"""
+    # The connection goes back to the pool once the body is drained, or
+    # immediately if the downstream client goes away mid-transfer.
+    try:
+        async for chunk in response.aiter_raw():
+            yield chunk
+    finally:
+        await release()
+
+class RelayedResponse(StreamingResponse):
+    """StreamingResponse that releases its upstream however sending ends"""
+    # A body generator that never started (client gone before the first
+    # chunk, or a compressor that never pulled) skips its finally block, so
+    # the release also runs here, around the whole response.
+
+    def __init__(self, content, release: UpstreamRelease, **kwargs):
+        super().__init__(content, **kwargs)
+        self.release = release
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.release()
+
+def new_ws_counters():
+    return {
+        'opened_at': time.time(),
+        'client_to_node_messages': 0,
+        'client_to_node_bytes': 0,
+        'node_to_client_messages': 0,
+        'node_to_client_bytes': 0,
+    }
+
+def frame_size(data):
+    return len(data.encode()) if isinstance(data, str) else len(data)
+
+async def pump_client_to_node(websocket: WebSocket, upstream, counters):
+    """Forward browser frames to Node; each send is awaited before the next read"""
+    while True:
+        message = await websocket.receive()
+        if message['type'] == 'websocket.disconnect':
+            return
+        data = message.get('text')
+        if data is None:
+            data = message.get('bytes') or b''
+        await upstream.send(data)
+        counters['client_to_node_messages'] += 1
+        counters['client_to_node_bytes'] += frame_size(data)
+
+async def pump_node_to_client(websocket: WebSocket, upstream, counters):
+    """Forward Node frames to the browser until the upstream socket closes"""
+    async for data in upstream:
+        if isinstance(data, str):
+            await websocket.send_text(data)
+        else:
+            await websocket.send_bytes(data)
+        counters['node_to_client_messages'] += 1
+        counters['node_to_client_bytes'] += frame_size(data)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if PROXY_MAX_IN_FLIGHT_PER_WORKER * NODE_WORKERS > PROXY_MAX_CONNECTIONS:
+        print(f"Warning: {NODE_WORKERS} workers x PROXY_MAX_IN_FLIGHT_PER_WORKER={PROXY_MAX_IN_FLIGHT_PER_WORKER} "
+              f"exceeds PROXY_MAX_CONNECTIONS={PROXY_MAX_CONNECTIONS}; excess requests wait in the pool, not the queue")
+    app.state.upstream = create_upstream_client()
+    supervisor = asyncio.create_task(supervise_node_workers(app.state.upstream))
+    try:
+        yield
+    finally:
+        supervisor.cancel()
+        await stop_node_workers_async()
+        await app.state.upstream.aclose()
+
 # Create FastAPI app that proxies to Node
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+
+@app.get('/_proxy/pool')
+async def proxy_pool_stats(request: Request):
+    """Expose upstream pool usage so the limits can be sized"""
+    return JSONResponse({
+        **pool_stats,
+        'connections': pool_connection_counts(request.app.state.upstream),
+        'limits': {
+            'max_connections': PROXY_MAX_CONNECTIONS,
+            'max_keepalive_connections': PROXY_MAX_KEEPALIVE_CONNECTIONS,
+            'keepalive_expiry': PROXY_KEEPALIVE_EXPIRY,
+        },
+    })
+
+@app.get('/metrics')
+async def metrics():
+    """Prometheus scrape endpoint; answered here, never forwarded to Node"""
+    return Response(content=render_metrics(), media_type='text/plain; version=0.0.4')
+
+@app.get('/_proxy/cache')
+async def proxy_cache_stats():
+    """Expose response cache hit rates and size"""
+    return JSONResponse(response_cache.describe())
+
+@app.get('/_proxy/workers')
+async def proxy_worker_stats():
+    """Expose Node worker health, load and restart counts"""
+    return JSONResponse({'workers': [worker.describe() for worker in node_workers]})
+
+@app.get('/_proxy/websockets')
+async def proxy_websocket_stats():
+    """Expose aggregate and per-connection WebSocket passthrough counters"""
+    return JSONResponse({
+        **ws_stats,
+        'connections': {str(conn_id): counters for conn_id, counters in ws_connections.items()},
+    })
+
+@app.websocket('/socket.io/')
+async def proxy_socketio(websocket: WebSocket):
+    """Pump Socket.io WebSocket frames between the browser and Node"""
+    # HTTP middleware never sees websocket scopes, so the upgrade lands here
+    await websocket.accept()
+    conn_id = next(ws_connection_ids)
+    counters = new_ws_counters()
+    ws_connections[conn_id] = counters
+    ws_stats['connections_total'] += 1
+    ws_stats['connections_open'] += 1
+
+    worker = pinned_worker(socket_pin_key(websocket))
+    url = f"{worker.ws_url}/socket.io/?{websocket.url.query}"
+    headers = {
+        key: value
+        for key, value in websocket.headers.items()
+        if key.lower() in WS_FORWARD_HEADERS
+    }
+    try:
+        # max_queue bounds frames buffered from Node; once it fills we stop
+        # reading and TCP flow control pushes back on the Node side.
+        async with ws_connect(
+            url,
+            max_queue=PROXY_WS_MAX_QUEUE,
+            max_size=PROXY_WS_MAX_SIZE,
+            **{WS_HEADERS_ARG: headers},
+        ) as upstream:
+            pumps = [
+                asyncio.create_task(pump_client_to_node(websocket, upstream, counters)),
+                asyncio.create_task(pump_node_to_client(websocket, upstream, counters)),
+            ]
+            done, pending = await asyncio.wait(pumps, return_when=asyncio.FIRST_COMPLETED)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for task in done:
+                task.exception()  # closed sockets end the pumps; mark as retrieved
+    except Exception as e:
+        ws_stats['upstream_errors'] += 1
+        print(f"WebSocket proxy error: {str(e)}")
+    finally:
+        ws_connections.pop(conn_id, None)
+        ws_stats['connections_open'] -= 1
+        for key in ('client_to_node_messages', 'client_to_node_bytes',
+                    'node_to_client_messages', 'node_to_client_bytes'):
+            ws_stats[key] += counters[key]
+        try:
+            await websocket.close()
+        except (RuntimeError, WebSocketDisconnect):
+            pass  # already closed by the client
 
 @app.middleware("http")
 async def proxy_to_node(request: Request, call_next):
     """Proxy all requests to the Node.js server"""
-    async with httpx.AsyncClient() as client:
-        url = f"http://localhost:8002{request.url.path}"
-        if request.url.query:
-            url += f"?{request.url.query}"
-        
+    if request.url.path.startswith(INTERNAL_PREFIX):
+        if not internal_client(request):
+            return Response(content='Not Found', status_code=404)
+        return await call_next(request)
+    if request.url.path in LOCAL_PATHS:
+        return await call_next(request)
+
+    timer = RequestTimer(request)
+    response = static_response(request)
+    if response is not None:
+        timer.finish(response.status_code)
+        return response
+
+    cache_key = None
+    cache_board = None
+    headers = filter_headers(request.headers)
+    if request.method == 'GET':
+        cacheable, cache_board = cacheable_route(request.url.path)
+        cache_key = response_cache_key(request) if cacheable else None
+        if cache_key:
+            entry = response_cache.get(cache_key)
+            if entry:
+                response = cached_response(entry, request)
+                timer.finish(response.status_code)
+                return response
+            generation = response_cache.generation
+            headers = {k: v for k, v in headers.items() if k not in CONDITIONAL_HEADERS}
+
+    client = request.app.state.upstream
+    worker = route_worker(request)
+    url = f"{worker.url}{request.url.path}"
+    if request.url.query:
+        url += f"?{request.url.query}"
+    route = timer.route
+    slot = UpstreamSlot(worker)
+    response = None
+    handed_off = False
+    try:
+        # Socket.io long-polls sit idle in Node for ~25s, so they bypass the cap
+        if not request.url.path.startswith('/socket.io/'):
+            try:
+                await worker.admission.acquire(request_priority(request, route), PROXY_QUEUE_TIMEOUT)
+            except (Overloaded, asyncio.TimeoutError) as e:
+                reason = 'shed' if isinstance(e, Overloaded) else 'queue_timeout'
+                pool_stats['queue_timeouts' if reason == 'queue_timeout' else 'shed'] += 1
+                timer.upstream_error(reason)
+                timer.finish(503)
+                return overloaded_response(reason)
+            slot.admitted = True
+
         try:
-            # Forward the request to Node.js server
-            response = await client.request(
+            # Stream the request body upstream as it arrives instead of buffering it
+            upstream_request = client.build_request(
                 method=request.method,
                 url=url,
-                headers=dict(request.headers),
-                content=await request.body(),
-                timeout=30.0
-            )
-            
-            return Response(
-                content=response.content,
-                status_code=response.status_code,
-                headers=dict(response.headers)
+                headers=headers,
+                content=request.stream() if has_request_body(request) else None,
+                # A bare float would also replace the client's pool timeout
+                timeout=httpx.Timeout(PROXY_ROUTE_TIMEOUTS.get(route, PROXY_TIMEOUT), pool=PROXY_POOL_TIMEOUT),
             )
+            timer.begin_upstream()
+            response = await client.send(upstream_request, stream=True)
+            timer.end_upstream()
+        except httpx.PoolTimeout as e:
+            pool_stats['pool_timeouts'] += 1
+            timer.upstream_error('pool_timeout')
+            timer.finish(503)
+            return Response(content=f"Proxy error: {str(e)}", status_code=503)
         except Exception as e:
+            if request.method in MUTATING_METHODS:
+                # The write may still have been applied
+                invalidate_for_mutation(request)
+            pool_stats['upstream_errors'] += 1
+            timer.upstream_error(type(e).__name__)
+            timer.finish(502)
             return Response(content=f"Proxy error: {str(e)}", status_code=502)
+
+        if request.method in MUTATING_METHODS:
+            # Node has applied the write by the time it answers. Reads that were
+            # in flight meanwhile see the generation bump and are not stored, so
+            # this single invalidation also covers them.
+            invalidate_for_mutation(request, response)
+
+        content_length = int(response.headers.get('content-length') or -1)
+        if cache_key and response.status_code == 200 and 0 <= content_length <= PROXY_CACHE_MAX_ENTRY_BYTES:
+            try:
+                body = b''.join([chunk async for chunk in response.aiter_raw()])
+            finally:
+                await release_upstream(response, slot, timer)
+            response_headers = filter_headers(response.headers)
+            response_headers.pop('etag', None)
+            if generation != response_cache.generation:
+                # A mutation raced this read; serve it but don't keep it
+                return Response(content=body, status_code=200, headers=response_headers)
+            entry = response_cache.put(cache_key, cache_board, 200, response_headers, body)
+            return cached_response(entry, request)
+
+        response_headers = filter_headers(response.headers)
+        release = UpstreamRelease(response, slot, timer)
+        body = relay_body(response, release)
+        encoding = negotiate_encoding(request)
+        if encoding and should_compress(request, response.status_code, response_headers):
+            body = compress_stream(body, encoding)
+            response_headers = encoded_headers(response_headers, encoding)
+        timer.respond()
+        handed_off = True
+        return RelayedResponse(
+            body,
+            release,
+            status_code=response.status_code,
+            headers=response_headers,
+        )
+    finally:
+        # Every path but the streamed relay is done with the upstream here,
+        # including cancellations and unexpected errors
+        if not handed_off:
+            if response is not None:
+                await response.aclose()
+            slot.release()
+            timer.finish(response.status_code if response is not None else 500)
@@ -3,29 +3,57 @@ import http from "http";
 import { Card } from "./models/Card";
 import { Note } from "./models/Note";
 import { Activity } from "./models/Activity";
+import { Board } from "./models/Board";
+import { verifyAccessToken } from "./middleware/authMiddleware";
+import { activityRoom, boardRoom, userRoom } from "./realtime";
 
 export function initSocket(server: http.Server) {
   const io = new IOServer(server, {
     cors: { origin: process.env.CORS_ORIGIN || "*", credentials: true },
   });
 
+  if (Number(process.env.NODE_WORKERS || 1) > 1 && (process.env.NODE_WORKER_INDEX ?? "0") === "0") {
+    console.warn("Activity feed sockets only receive boards served by their own worker; run NODE_WORKERS=1 for a complete feed");
+  }
+
   io.on("connection", (socket) => {
     console.log("socket connected", socket.id);
+    // Lets clients skip board pinning when there is only one worker
+    socket.emit("server:info", { workers: Number(process.env.NODE_WORKERS || 1) });
 
     socket.on("joinBoard", (boardId: string) => {
-      const room = `board:${boardId}`;
+      const room = boardRoom(boardId);
       socket.join(room);
       socket.to(room).emit("presence:update", { id: socket.id, event: "join" });
     });
 
     socket.on("leaveBoard", (boardId: string) => {
-      const room = `board:${boardId}`;
+      const room = boardRoom(boardId);
       socket.leave(room);
       socket
         .to(room)
         .emit("presence:update", { id: socket.id, event: "leave" });
     });
 
+    // Opt-in activity feed: activities of every board the user belongs to,
+    // plus their own board-less activities
+    socket.on("activity:subscribe", async (data) => {
+      try {
+        const userId = verifyAccessToken(data?.token);
+        const boards = await Board.find({ "members.userId": userId }, { _id: 1 }).lean();
+        socket.join([userRoom(userId), ...boards.map((b: any) => activityRoom(b._id))]);
+        socket.emit("activity:subscribed", { boards: boards.length });
+      } catch (err) {
+        socket.emit("error", { message: "Failed to subscribe to activity" });
+      }
+    });
+
+    socket.on("activity:unsubscribe", () => {
+      for (const room of [...socket.rooms]) {
+        if (room.startsWith("activity:") || room.startsWith("user:")) socket.leave(room);
+      }
+    });
+
     // Card creation is handled by HTTP API, not socket
     // Socket only receives broadcast from server after HTTP create
 
@@ -43,7 +71,7 @@ export function initSocket(server: http.Server) {
           { content, updatedBy, updatedAt: new Date() },
           { upsert: true, new: true },
         );
-        const room = `board:${boardId}`;
+        const room = boardRoom(boardId);
         socket.to(room).emit("note:update", note);
         socket.emit("note:update:ok", note);
       } catch (err) {
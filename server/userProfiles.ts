@@ -0,0 +1,57 @@
+import { User } from "./models/User";
+
+// Public profile fields embedded in cards and activities
+export interface UserProfile {
+  _id: unknown;
+  name: string;
+  email: string;
+  avatarUrl?: string;
+}
+
+// Per-process cache; each Node worker holds its own copy, so TTL bounds how
+// long a profile change made through another worker can stay invisible.
+const PROFILE_CACHE_TTL_MS = Number(process.env.PROFILE_CACHE_TTL_MS ?? 60_000);
+const PROFILE_CACHE_MAX = Number(process.env.PROFILE_CACHE_MAX ?? 10_000);
+
+const profiles = new Map<string, { profile: UserProfile | null; expires: number }>();
+const inflight = new Map<string, Promise<UserProfile | null>>();
+
+export async function getUserProfile(userId: unknown): Promise<UserProfile | null> {
+  if (!userId) return null;
+  const key = String(userId);
+  const cached = profiles.get(key);
+  if (cached && cached.expires > Date.now()) {
+    // Re-insert so Map order doubles as LRU order
+    profiles.delete(key);
+    profiles.set(key, cached);
+    return cached.profile;
+  }
+  // Concurrent misses for the same user share one query
+  let pending = inflight.get(key);
+  if (!pending) {
+    const load: Promise<UserProfile | null> = User.findById(key, "name email avatarUrl")
+      .lean()
+      .then((profile: any) => {
+        // Invalidated while the query ran: the result may predate the change
+        if (inflight.get(key) !== load) return profile as UserProfile | null;
+        profiles.delete(key);
+        profiles.set(key, { profile, expires: Date.now() + PROFILE_CACHE_TTL_MS });
+        while (profiles.size > PROFILE_CACHE_MAX) {
+          profiles.delete(profiles.keys().next().value as string);
+        }
+        return profile as UserProfile | null;
+      })
+      .finally(() => {
+        if (inflight.get(key) === load) inflight.delete(key);
+      });
+    inflight.set(key, load);
+    pending = load;
+  }
+  return pending;
+}
+
+// Also detaches a load already in flight, so it cannot write the old profile back
+export function invalidateUserProfile(userId: unknown) {
+  profiles.delete(String(userId));
+  inflight.delete(String(userId));
+}